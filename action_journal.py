@@ -0,0 +1,196 @@
+# action_journal.py
+#
+# Write-ahead journal of every change GameEngine makes to saved state: keys
+# bought, chest drops, sales, equips and unequips, upgrades and adventure
+# rewards. Each action is one JSON line tagged with a sequence number. Lines
+# are buffered and fsynced in batches, so keeping the save current costs
+# only the actions since the last snapshot.
+#
+# Every `snapshot_every` actions the journal is sealed as journal.log.<seq>,
+# a new one is started and the whole state is saved, in the background when
+# a BackgroundSaver is given. Sealed journals are deleted once the snapshot
+# covering them is on disk.
+#
+# Recovery loads the snapshot and replays the lines of every journal after
+# the sequence number stored in it, so a crash anywhere along the way never
+# loses or repeats an action. A last line cut short by a crash is ignored.
+# A save or journal that can't be read is renamed to *.corrupt rather than
+# deleted, and the game goes on from whatever was restored before it.
+#
+# Combat damage isn't journaled: after a crash health is what it was at the
+# snapshot, or full if a replayed reward levelled the character up.
+
+import glob
+import json
+import os
+import time
+
+from game_engine import GameEngine, GameError
+from save_game import SAVE_PATH, save_game, load_game
+
+JOURNAL_PATH = "saves/journal.log"
+
+# How to apply each journaled action again
+_REPLAY = {
+    "buy_key": GameEngine.buy_key,
+    "chest": GameEngine.receive_chest_items,
+    "sell": GameEngine.sell_item,
+    "equip": GameEngine.equip_item,
+    "unequip": GameEngine.unequip_item,
+    "upgrade": GameEngine.upgrade_max_adventures,
+    "rewards": GameEngine.receive_rewards
+}
+
+
+class ActionJournal:
+    def __init__(self, engine, path=JOURNAL_PATH, snapshot_path=SAVE_PATH,
+                 batch_size=256, max_delay=1.0, snapshot_every=10000, saver=None):
+        self.engine = engine
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.saver = saver                    # autosave.BackgroundSaver, or None to save inline
+        self.batch_size = batch_size          # fsync after this many actions...
+        self.max_delay = max_delay            # ...or once this many seconds have passed
+        self.snapshot_every = snapshot_every
+        self.sequence = 0                     # last action written
+        self.snapshot_sequence = 0            # last action in the snapshot
+        self.pending = 0                      # actions written since the last fsync
+        self.last_sync = time.monotonic()
+        self.file = None
+
+    def open(self):
+        """Restore the engine from the snapshot and journal, then journal its actions.
+
+        Returns True if there was any saved state to restore. If the save or
+        a journal can't be read they're renamed to *.corrupt, the state as
+        far as it got is saved as a new snapshot and GameError is raised;
+        actions are journaled either way.
+        """
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            restored = self._restore()
+        except GameError:
+            self._set_aside()
+            self.sequence = self.snapshot_sequence = 0
+            self.file = open(self.path, "w", encoding="utf-8")
+            self.engine.journal = self
+            save_game(self.engine, self.snapshot_path, extra={"journal.sequence": 0})
+            raise
+
+        self.engine.journal = self
+        if self.sequence > self.snapshot_sequence:
+            # Fold the replayed tail into a fresh snapshot
+            self.snapshot()
+        else:
+            self._drop_sealed(self.snapshot_sequence)
+            self.file = open(self.path, "w", encoding="utf-8")
+        return restored
+
+    def _restore(self):
+        counters = load_game(self.engine, self.snapshot_path)
+        restored = counters is not None
+        self.sequence = self.snapshot_sequence = counters.get("journal.sequence", 0) if restored else 0
+
+        for sequence, action, args in self._read():
+            if sequence > self.sequence:
+                replay = _REPLAY.get(action)
+                if replay is None:
+                    raise GameError("Can't Load Save", f"The journal has an unknown action {action!r}.")
+                try:
+                    replay(self.engine, *args)
+                except (TypeError, ValueError, IndexError, KeyError) as e:
+                    raise GameError("Can't Load Save", f"The journal's {action!r} action is damaged ({e}).") from e
+                self.sequence = sequence
+                restored = True
+        return restored
+
+    def _set_aside(self):
+        # Keep files that couldn't be read for a look later, out of the way
+        # of the new save and journal
+        for path in [self.snapshot_path, self.path] + [path for _, path in self._sealed()]:
+            if os.path.exists(path):
+                os.replace(path, path + ".corrupt")
+
+    def _sealed(self):
+        # (last sequence, path) of every sealed journal, oldest first
+        sealed = []
+        for path in glob.glob(glob.escape(self.path) + ".*"):
+            suffix = path[len(self.path) + 1:]
+            if suffix.isdigit():
+                sealed.append((int(suffix), path))
+        return sorted(sealed)
+
+    def _drop_sealed(self, sequence):
+        for last, path in self._sealed():
+            if last <= sequence:
+                os.remove(path)
+
+    def _read(self):
+        for path in [path for _, path in self._sealed()] + [self.path]:
+            try:
+                f = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with f:
+                for number, line in enumerate(f, 1):
+                    if not line.endswith("\n"):
+                        break  # cut short by a crash
+                    try:
+                        sequence, action, *args = json.loads(line)
+                        if not isinstance(sequence, int) or not isinstance(action, str):
+                            raise ValueError("not a journal entry")
+                    except (ValueError, TypeError) as e:
+                        raise GameError("Can't Load Save",
+                                        f"Line {number} of {path} is damaged ({e}).") from e
+                    yield sequence, action, args
+
+    def record(self, action, *args):
+        self.sequence += 1
+        self.file.write(json.dumps([self.sequence, action, *args], separators=(",", ":")) + "\n")
+        self.pending += 1
+
+        if self.sequence - self.snapshot_sequence >= self.snapshot_every:
+            self.snapshot()
+        elif self.pending >= self.batch_size or time.monotonic() - self.last_sync >= self.max_delay:
+            self.sync()
+
+    def sync(self):
+        if self.file is not None and self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def snapshot(self):
+        """Seal the journal, start a new one and save the full state."""
+        if self.engine.journal is not self:
+            return  # not opened, so the journals on disk haven't been replayed
+        if self.file is not None and self.sequence == self.snapshot_sequence:
+            return  # nothing new since the last snapshot
+        self.sync()
+        sequence = self.sequence
+        if self.file is not None:
+            self.file.close()
+        if os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.{sequence}")
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.snapshot_sequence = sequence
+
+        extra = {"journal.sequence": sequence}
+        if self.saver is not None:
+            self.saver.save(extra, on_saved=lambda: self._drop_sealed(sequence))
+        else:
+            save_game(self.engine, self.snapshot_path, extra=extra)
+            self._drop_sealed(sequence)
+
+    def close(self):
+        """Stop journaling, once any snapshot still being saved is written."""
+        if self.saver is not None:
+            self.saver.wait()
+        self.sync()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.engine.journal is self:
+            self.engine.journal = None
@@ -0,0 +1,56 @@
+# adventure_registry.py
+#
+# Running adventures keyed by ids that are never reused. Entries live in a
+# slot table: a freed slot goes on a free list and is handed to the next
+# adventure, so add, get and remove are all O(1) and the table only grows to
+# the highest number of adventures that ever ran at once.
+
+import itertools
+
+
+class AdventureRegistry:
+    def __init__(self):
+        self._next_id = itertools.count(1)
+        self._slots = []   # slot -> (adventure_id, entry) or None
+        self._free = []    # slots free for reuse
+        self._index = {}   # adventure_id -> slot
+
+    def add(self, entry):
+        adventure_id = next(self._next_id)
+        if self._free:
+            slot = self._free.pop()
+            self._slots[slot] = (adventure_id, entry)
+        else:
+            slot = len(self._slots)
+            self._slots.append((adventure_id, entry))
+        self._index[adventure_id] = slot
+        return adventure_id
+
+    def get(self, adventure_id, default=None):
+        slot = self._index.get(adventure_id)
+        if slot is None:
+            return default
+        return self._slots[slot][1]
+
+    def __getitem__(self, adventure_id):
+        return self._slots[self._index[adventure_id]][1]
+
+    def remove(self, adventure_id):
+        slot = self._index.pop(adventure_id)
+        entry = self._slots[slot][1]
+        self._slots[slot] = None
+        self._free.append(slot)
+        return entry
+
+    def __contains__(self, adventure_id):
+        return adventure_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def items(self):
+        # Snapshot, so entries may be removed while iterating
+        return [slot for slot in self._slots if slot is not None]
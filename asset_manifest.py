@@ -0,0 +1,118 @@
+# asset_manifest.py
+#
+# Discovers item icons from the asset tree instead of a hand-written list.
+# Layout is assets/images/items/<rarity>/<type>/<Item Name>.png
+#
+# The result of a scan is cached in .cache/asset_manifest.json together with
+# the mtime of every directory that was walked. Adding, removing or renaming a
+# file changes the mtime of the directory it lives in, so on a warm start we
+# only stat those directories instead of walking the whole tree again.
+
+import json
+import os
+
+ASSET_ROOT = "assets/images/items"
+MANIFEST_CACHE = ".cache/asset_manifest.json"
+MANIFEST_VERSION = 2
+IMAGE_EXTENSIONS = (".png", ".gif", ".jpg", ".jpeg")
+
+
+def scan_assets(root=ASSET_ROOT):
+    """Walk the asset tree and return (items, dir_mtimes).
+
+    items maps rarity -> item name -> {"type", "path"}, so the same file
+    name under two rarities is two items.
+    """
+    items = {}
+    dir_mtimes = {root: os.stat(root).st_mtime_ns}
+
+    for rarity in sorted(os.listdir(root)):
+        rarity_dir = os.path.join(root, rarity)
+        if not os.path.isdir(rarity_dir):
+            continue  # loose files such as missingTex.png
+        dir_mtimes[rarity_dir] = os.stat(rarity_dir).st_mtime_ns
+
+        for item_type in sorted(os.listdir(rarity_dir)):
+            type_dir = os.path.join(rarity_dir, item_type)
+            if not os.path.isdir(type_dir):
+                continue
+            dir_mtimes[type_dir] = os.stat(type_dir).st_mtime_ns
+
+            for filename in sorted(os.listdir(type_dir)):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() not in IMAGE_EXTENSIONS:
+                    continue
+                # Keep forward slashes so the cache is portable
+                items.setdefault(rarity, {})[name] = {
+                    "type": item_type,
+                    "path": f"{root}/{rarity}/{item_type}/{filename}"
+                }
+
+    return items, dir_mtimes
+
+
+def _is_fresh(cached, root):
+    if cached.get("version") != MANIFEST_VERSION or cached.get("root") != root:
+        return False
+    try:
+        for path, mtime in cached["dirs"].items():
+            if os.stat(path).st_mtime_ns != mtime:
+                return False
+    except OSError:
+        return False  # a directory was removed
+    return True
+
+
+def load_manifest(root=ASSET_ROOT, cache_path=MANIFEST_CACHE):
+    """Return the item manifest, rescanning only when the tree has changed."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if _is_fresh(cached, root):
+            return cached["items"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if not os.path.isdir(root):
+        return {}
+
+    items, dir_mtimes = scan_assets(root)
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "root": root,
+                "dirs": dir_mtimes,
+                "items": items
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Failed to write asset manifest cache: {e}")
+
+    return items
+
+
+def merge_into_catalog(catalog, manifest):
+    """Add discovered items that are missing from a rarity -> type -> [names] catalog.
+
+    Only rarities and types the catalog already has are merged; anything
+    else has no stats or slot in the game.
+    """
+    for rarity, entries in manifest.items():
+        types = catalog.get(rarity)
+        if types is None:
+            continue  # unknown rarity folder
+        for name, entry in entries.items():
+            names = types.get(entry["type"])
+            if names is None:
+                print(f"Skipping {entry['path']}: unknown item type {entry['type']!r}")
+            elif name not in names:
+                names.append(name)
+    return catalog
+
+
+def manifest_paths(manifest):
+    """item name -> icon path, for every rarity in the manifest."""
+    return {name: entry["path"] for entries in manifest.values() for name, entry in entries.items()}
@@ -0,0 +1,140 @@
+# async_runtime.py
+#
+# Optional asyncio runtime. Each adventure is a coroutine that awaits its
+# combat rounds and completion in order, so thousands of them can share one
+# event loop without threads.
+#
+# Time comes from the engine's clock:
+#   - AsyncioClock runs in real time on the asyncio loop (used by the GUI
+#     with --asyncio, where run_tk() pumps Tk from the same loop)
+#   - a game_clock.SimClock runs simulated time, moved on by
+#     AdventureRuntime.advance()
+
+import asyncio
+
+
+class AsyncioClock:
+    """Engine clock backed by an asyncio event loop."""
+
+    def __init__(self, loop=None):
+        self.loop = loop or asyncio.get_running_loop()
+
+    def now(self):
+        return self.loop.time()
+
+    def call_at(self, when, callback, *args):
+        return self.loop.call_at(when, callback, *args)
+
+    def call_later(self, delay, callback, *args):
+        return self.loop.call_later(delay, callback, *args)
+
+    def cancel(self, handle):
+        handle.cancel()
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdventureRuntime:
+    def __init__(self, engine, loop=None):
+        self.engine = engine
+        self.loop = loop or asyncio.get_running_loop()
+        self.tasks = {}  # adventure_id -> asyncio.Task
+        self._redraw_pending = False
+        self.closed = False
+
+    async def sleep_until(self, when):
+        clock = self.engine.clock
+        if when <= clock.now():
+            return
+        future = self.loop.create_future()
+        handle = clock.call_at(when, _wake, future)
+        try:
+            await future
+        finally:
+            clock.cancel(handle)
+
+    def start(self, zone_name):
+        """Start an adventure now and drive it from a coroutine. Returns its id."""
+        adventure_id = self.engine.start_adventure(zone_name, scheduled=False)
+        if adventure_id is not None:
+            task = self.loop.create_task(self.run_adventure(adventure_id))
+            self.tasks[adventure_id] = task
+            task.add_done_callback(lambda _: self.tasks.pop(adventure_id, None))
+        return adventure_id
+
+    async def run_adventure(self, adventure_id):
+        engine = self.engine
+        combat = engine.adventures[adventure_id]
+        try:
+            # One round per interval until death or the end (which wins a tie)
+            while combat.combat_active and combat.next_tick < combat.ends_at:
+                await self.sleep_until(combat.next_tick)
+                if adventure_id not in engine.adventures:
+                    return None  # skipped or cancelled meanwhile
+                combat.next_tick += engine.tick_interval
+                engine.combat_tick(adventure_id)
+                self._request_redraw()
+
+            await self.sleep_until(combat.ends_at)
+            result = engine.complete_adventure(adventure_id)
+            self._request_redraw()
+            return result
+        except asyncio.CancelledError:
+            if not self.closed:
+                engine.cancel_adventure(adventure_id)
+            raise
+
+    def cancel(self, adventure_id):
+        task = self.tasks.get(adventure_id)
+        if task is not None:
+            task.cancel()
+
+    def close(self):
+        """Stop driving adventures, leaving them as they are in the engine.
+
+        For shutdown: the cancelled coroutines no longer touch the engine,
+        so nothing is logged or journaled after the game has closed.
+        """
+        self.closed = True
+        for task in list(self.tasks.values()):
+            task.cancel()
+
+    def _request_redraw(self):
+        # Many adventures wake on the same tick, redraw once for all of them
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.loop.call_soon(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        if not self.closed:
+            self.engine.changed()
+
+    async def advance(self, seconds):
+        """Move a SimClock forward, letting woken coroutines run at each step."""
+        clock = self.engine.clock
+        target = clock.now() + seconds
+        while True:
+            # Let woken adventures run up to their next await
+            await asyncio.sleep(0)
+            next_when = clock.next_deadline()
+            if next_when is None or next_when > target:
+                break
+            clock.advance(next_when - clock.now())
+        clock.advance(target - clock.now())
+        await asyncio.sleep(0)
+
+
+async def run_tk(root, interval=1 / 60):
+    """Pump the Tk event loop from asyncio until the window is closed."""
+    from tkinter import TclError
+
+    try:
+        while True:
+            root.update()
+            await asyncio.sleep(interval)
+    except TclError:
+        pass  # root was destroyed
@@ -0,0 +1,62 @@
+# autosave.py
+#
+# Saves without stalling the game. save() only captures the state (a few
+# counters, the character and a pinned reference to the inventory list, no
+# matter how long it is) and queues it; a writer thread encodes it, writes a
+# temp file and renames it over the save. If the game changes the inventory
+# while a save is still being written, the engine swaps in a copy first, so
+# the writer always sees the inventory as it was when save() was called.
+
+import queue
+import threading
+
+from save_game import SAVE_PATH, capture, encode_state, release_state, write_save
+
+
+class BackgroundSaver:
+    def __init__(self, engine, path=SAVE_PATH, compress=True):
+        self.engine = engine
+        self.path = path
+        self.compress = compress
+        self.error = None  # last error from the writer, if any
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.thread.start()
+
+    def save(self, extra=None, on_saved=None):
+        """Capture the state now and write it in the background.
+
+        on_saved() is called from the writer thread once the save is on disk.
+        """
+        self.jobs.put((capture(self.engine, extra), on_saved))
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            state, on_saved = job
+            try:
+                write_save(encode_state(state, self.compress), self.path)
+                if on_saved is not None:
+                    on_saved()
+            except Exception as e:
+                # Keep the writer alive for the saves after this one; the
+                # game reports the error
+                self.error = e
+            finally:
+                release_state(self.engine, state)
+                self.jobs.task_done()
+
+    def take_error(self):
+        """The last error from the writer since this was last called, or None."""
+        error, self.error = self.error, None
+        return error
+
+    def wait(self):
+        """Block until every queued save is written."""
+        self.jobs.join()
+
+    def close(self):
+        self.jobs.put(None)
+        self.thread.join()
@@ -0,0 +1,149 @@
+# balance_sweep.py
+#
+# Zone balance report without playing the game. For every zone, character
+# level and gear rarity it runs back-to-back adventures through the
+# closed-form combat resolver, carrying health over between runs like the
+# game does, and reports:
+#   - survival: share of runs that end with the player alive
+#   - enemies per run (what the game counts as enemies defeated)
+#   - coins and exp per second, averaged over every base reward roll
+#
+# Gear is split into offense (weapon, ring, gloves) and defense (armor,
+# shield, necklace), each at one rarity or none.
+#
+# Usage:
+#   python balance_sweep.py --levels 1-30 --runs 20
+#   python balance_sweep.py --zones Forest "Dark Cave" --offense epic legendary --csv sweep.csv
+
+import argparse
+import csv
+import functools
+import itertools
+import multiprocessing
+import sys
+
+from game_engine import Adventure, Character, ITEM_STATS, adventure_reward, enemy_template
+from combat_resolver import resolve_runs, adventure_ticks
+from rarity_data import RARITY_MULTIPLIERS
+
+OFFENSE_TYPES = ("weapon", "ring", "gloves")
+DEFENSE_TYPES = ("armor", "shield", "necklace")
+RARITIES = ["none"] + list(RARITY_MULTIPLIERS)
+
+COLUMNS = ["zone", "level", "offense", "defense", "attack", "defense_stat", "max_health",
+           "survival", "enemies_per_run", "coins_per_sec", "exp_per_sec"]
+
+
+def build_character(level, offense, defense):
+    """A character levelled with level_up, plus the stats of one rarity per gear group.
+
+    The gear's stats are added straight from ITEM_STATS, so no made-up items
+    end up in the game's shared item cache.
+    """
+    character = Character()
+    for _ in range(level - 1):
+        character.level_up()
+    for rarity, item_types in ((offense, OFFENSE_TYPES), (defense, DEFENSE_TYPES)):
+        if rarity != "none":
+            for item_type in item_types:
+                character.computed_stats += ITEM_STATS[item_type, rarity]
+    return character
+
+
+@functools.lru_cache(maxsize=None)
+def expected_reward(reward_range, enemies_defeated):
+    # Average over every base roll, floored per roll exactly like the game
+    low, high = reward_range
+    return sum(adventure_reward(base, enemies_defeated) for base in range(low, high + 1)) / (high - low + 1)
+
+
+def sweep_zone_level(job):
+    """All gear combinations for one (zone, level). Returns a list of rows."""
+    zone_name, level, offense_rarities, defense_rarities, runs = job
+    zone = Adventure().zones[zone_name]
+    enemy = enemy_template(zone["level"])
+    ticks = adventure_ticks(zone)
+
+    rows = []
+    for offense, defense in itertools.product(offense_rarities, defense_rarities):
+        stats = build_character(level, offense, defense).computed_stats
+        survived = encounters = 0
+        coins = exp = 0.0
+        for outcome in resolve_runs(stats.attack, stats.defense, stats.health,
+                                    enemy.max_health, enemy.attack, enemy.defense, ticks, runs):
+            survived += not outcome.died
+            encounters += outcome.encounters
+            coins += expected_reward(zone["coin_reward"], outcome.encounters)
+            exp += expected_reward(zone["exp_reward"], outcome.encounters)
+
+        seconds = runs * zone["time"]
+        rows.append({
+            "zone": zone_name, "level": level, "offense": offense, "defense": defense,
+            "attack": stats.attack, "defense_stat": stats.defense, "max_health": stats.max_health,
+            "survival": survived / runs, "enemies_per_run": encounters / runs,
+            "coins_per_sec": coins / seconds, "exp_per_sec": exp / seconds
+        })
+    return rows
+
+
+def parse_levels(text):
+    """'1-5,10,20' -> [1, 2, 3, 4, 5, 10, 20]"""
+    levels = set()
+    for part in text.split(","):
+        low, _, high = part.partition("-")
+        levels.update(range(int(low), int(high or low) + 1))
+    return sorted(levels)
+
+
+def sweep(zones, levels, offense_rarities, defense_rarities, runs, processes=None):
+    all_zones = Adventure().zones
+    # Levels below a zone's requirement can't enter it, so they're left out
+    jobs = [(zone_name, level, offense_rarities, defense_rarities, runs)
+            for zone_name in zones for level in levels if level >= all_zones[zone_name]["level"]]
+    if processes == 1:
+        results = map(sweep_zone_level, jobs)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(sweep_zone_level, jobs)
+    return [row for rows in results for row in rows]
+
+
+def print_table(rows, out=sys.stdout):
+    out.write(f"{'zone':<16} {'lvl':>3} {'offense':<9} {'defense':<9} {'atk':>6} {'def':>6} {'hp':>7} "
+              f"{'survive':>7} {'enemies':>7} {'coins/s':>9} {'exp/s':>9}\n")
+    for row in rows:
+        out.write(f"{row['zone']:<16} {row['level']:>3} {row['offense']:<9} {row['defense']:<9} "
+                  f"{row['attack']:>6} {row['defense_stat']:>6} {row['max_health']:>7} "
+                  f"{row['survival']:>7.0%} {row['enemies_per_run']:>7.2f} "
+                  f"{row['coins_per_sec']:>9.2f} {row['exp_per_sec']:>9.2f}\n")
+
+
+def main(argv=None):
+    zone_names = list(Adventure().zones)
+    parser = argparse.ArgumentParser(description="Sweep zone balance across character levels and gear.")
+    parser.add_argument("--zones", nargs="+", default=zone_names, choices=zone_names)
+    parser.add_argument("--levels", type=parse_levels, default=parse_levels("1-30"),
+                        help="levels to test, e.g. 1-10,15,20 (default 1-30)")
+    parser.add_argument("--offense", nargs="+", default=RARITIES, choices=RARITIES,
+                        help="rarities for weapon, ring and gloves")
+    parser.add_argument("--defense", nargs="+", default=RARITIES, choices=RARITIES,
+                        help="rarities for armor, shield and necklace")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="back-to-back adventures per combination (default 10)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: one per CPU, 1 runs inline)")
+    parser.add_argument("--csv", help="write rows to this CSV file instead of printing a table")
+    args = parser.parse_args(argv)
+
+    rows = sweep(args.zones, args.levels, args.offense, args.defense, args.runs, args.processes)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
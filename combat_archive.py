@@ -0,0 +1,135 @@
+# combat_archive.py
+#
+# Full combat history on disk, so the log widget only ever has to hold the
+# lines on screen. Events are appended to a SQLite file in batches. Zone and
+# enemy names are stored once in a names table and referenced by id, and rows
+# are indexed by zone and by adventure so one zone or one run can be paged
+# without scanning everything.
+
+import os
+import sqlite3
+
+from combat_events import CombatEvent
+
+ARCHIVE_PATH = "logs/combat_log.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL,
+    adventure_id INTEGER,
+    kind INTEGER NOT NULL,
+    time REAL NOT NULL,
+    zone INTEGER,
+    enemy INTEGER,
+    a INTEGER, b INTEGER, c INTEGER
+);
+CREATE INDEX IF NOT EXISTS events_by_zone ON events (zone, id);
+CREATE INDEX IF NOT EXISTS events_by_adventure ON events (session, adventure_id, id);
+"""
+
+
+class CombatArchive:
+    def __init__(self, path=ARCHIVE_PATH, batch_size=500):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+        self.batch_size = batch_size
+        self.pending = []
+        self._name_ids = dict((name, i) for i, name in self.db.execute("SELECT id, name FROM names"))
+        self._names = {i: name for name, i in self._name_ids.items()}
+
+        # Adventure ids restart every run, so rows are tagged with a session
+        row = self.db.execute("SELECT MAX(session) FROM events").fetchone()
+        self.session = (row[0] or 0) + 1
+
+    def _name_id(self, name):
+        if name is None:
+            return None
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self.db.execute("INSERT INTO names (name) VALUES (?)", (name,)).lastrowid
+            self._name_ids[name] = name_id
+            self._names[name_id] = name
+        return name_id
+
+    def append(self, event):
+        self.pending.append((
+            self.session, event.adventure_id, event.kind, event.time,
+            self._name_id(event.zone), self._name_id(event.enemy), event.a, event.b, event.c
+        ))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.db.executemany(
+                "INSERT INTO events (session, adventure_id, kind, time, zone, enemy, a, b, c) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self.pending)
+            self.pending.clear()
+        self.db.commit()
+
+    def count(self, zone=None):
+        self.flush()
+        if zone is None:
+            return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return self.db.execute("SELECT COUNT(*) FROM events WHERE zone = ?",
+                               (self._name_ids.get(zone, -1),)).fetchone()[0]
+
+    def page(self, limit, zone=None, before=None, after=None):
+        """Up to `limit` (row_id, event) pairs, oldest first.
+
+        With before/after (row ids from an earlier page) this is the page
+        just older/newer than it, otherwise the newest one. Paging walks
+        the id index, so it costs the same anywhere in a long history.
+        """
+        self.flush()
+        clauses, args = [], []
+        if zone is not None:
+            clauses.append("zone = ?")
+            args.append(self._name_ids.get(zone, -1))
+        if before is not None:
+            clauses.append("id < ?")
+            args.append(before)
+        if after is not None:
+            clauses.append("id > ?")
+            args.append(after)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        order = "ASC" if after is not None else "DESC"
+
+        rows = self.db.execute(
+            "SELECT id, kind, time, adventure_id, zone, enemy, a, b, c FROM events" + where +
+            f" ORDER BY id {order} LIMIT ?", args + [limit]).fetchall()
+        if order == "DESC":
+            rows.reverse()
+        return [(row[0], self._event(row[1:])) for row in rows]
+
+    def adventure(self, adventure_id, session=None):
+        """Every event of one adventure (from this session unless given)."""
+        self.flush()
+        rows = self.db.execute(
+            "SELECT kind, time, adventure_id, zone, enemy, a, b, c FROM events "
+            "WHERE session = ? AND adventure_id = ? ORDER BY id",
+            (self.session if session is None else session, adventure_id))
+        return [self._event(row) for row in rows]
+
+    def zones(self):
+        self.flush()
+        rows = self.db.execute("SELECT DISTINCT zone FROM events WHERE zone IS NOT NULL")
+        return sorted(self._names[zone_id] for zone_id, in rows)
+
+    def _event(self, row):
+        kind, time, adventure_id, zone, enemy, a, b, c = row
+        return CombatEvent(kind, time, adventure_id, self._names.get(zone), self._names.get(enemy), a, b, c)
+
+    def close(self):
+        self.flush()
+        self.db.close()
@@ -0,0 +1,64 @@
+# combat_events.py
+#
+# The engine reports what happens in adventures as small typed events instead
+# of ready-made log strings. Text is only built by format_event(), when a log
+# view actually shows the line, so headless runs never format anything.
+#
+# Every event has the same fields; a, b and c are numbers whose meaning
+# depends on the kind (see format_event).
+
+from collections import namedtuple
+
+CombatEvent = namedtuple("CombatEvent", ["kind", "time", "adventure_id", "zone", "enemy", "a", "b", "c"])
+
+# Event kinds
+ENTER = 0            # -
+ENCOUNTER = 1        # enemy
+HIT = 2              # enemy, a=damage, b=enemy health, c=enemy max health
+ENEMY_HIT = 3        # enemy, a=damage, b=player health, c=player max health
+DEFEAT = 4           # -
+COMPLETE = 5         # a=enemies defeated, b=coins, c=exp
+SKIP = 6             # a=seconds skipped, b=enemies slain, c=damage taken
+ABANDON = 7          # -
+LEVEL_REQUIRED = 8   # a=level needed
+ADVENTURES_FULL = 9  # a=max adventures
+
+EVENT_NAMES = {
+    ENTER: "enter",
+    ENCOUNTER: "encounter",
+    HIT: "hit",
+    ENEMY_HIT: "enemy_hit",
+    DEFEAT: "defeat",
+    COMPLETE: "complete",
+    SKIP: "skip",
+    ABANDON: "abandon",
+    LEVEL_REQUIRED: "level_required",
+    ADVENTURES_FULL: "adventures_full"
+}
+
+
+def format_event(event):
+    kind, zone = event.kind, event.zone
+    if kind == HIT:
+        return f"[{zone}] You deal {event.a} damage to {event.enemy} ({event.b}/{event.c} HP)"
+    if kind == ENEMY_HIT:
+        return f"[{zone}] {event.enemy} deals {event.a} damage to you ({event.b}/{event.c} HP)"
+    if kind == ENCOUNTER:
+        return f"\n[{zone}] Encountered {event.enemy}!"
+    if kind == ENTER:
+        return f"\nEntering {zone}..."
+    if kind == DEFEAT:
+        return f"\n[{zone}] You have been defeated!"
+    if kind == COMPLETE:
+        return (f"\n[{zone}] Adventure Complete!\n"
+                f"[{zone}] Enemies Defeated: {event.a}\n"
+                f"[{zone}] Earned: {event.b} coins and {event.c} exp!")
+    if kind == SKIP:
+        return f"\n[{zone}] Skipped {event.a}s of combat: {event.b} enemies slain, {event.c} damage taken"
+    if kind == ABANDON:
+        return f"\n[{zone}] Adventure abandoned."
+    if kind == LEVEL_REQUIRED:
+        return f"Need level {event.a} to enter {zone}!"
+    if kind == ADVENTURES_FULL:
+        return f"Cannot start new adventure. Maximum of {event.a} concurrent adventures reached!"
+    return f"[{zone}] {EVENT_NAMES.get(kind, kind)}"
@@ -0,0 +1,55 @@
+# combat_log.py
+#
+# Keeps the combat log Text widget cheap over long sessions. Entries (combat
+# events or plain strings) are queued in a ring buffer and written to the
+# widget at most once per frame in a single insert, and the widget never holds
+# more than max_lines lines. Entries are only turned into text by `formatter`
+# when they are written, so ones that fall out of the buffer cost nothing.
+
+import tkinter as tk
+from collections import deque
+
+
+class CombatLogView:
+    def __init__(self, text_widget, max_lines=1000, flush_ms=16, formatter=str):
+        self.text = text_widget
+        self.formatter = formatter
+        self.max_lines = max_lines
+        self.flush_ms = flush_ms
+        # Anything older than max_lines would be trimmed right away anyway
+        self.pending = deque(maxlen=max_lines)
+        self.line_count = 0
+        self._flush_id = None
+
+    def add(self, entry):
+        self.pending.append(entry)
+        if self._flush_id is None:
+            self._flush_id = self.text.after(self.flush_ms, self.flush)
+
+    def flush(self):
+        self._flush_id = None
+        if not self.pending:
+            return
+
+        chunk = "\n".join(map(self.formatter, self.pending)) + "\n"
+        self.pending.clear()
+        self.text.insert(tk.END, chunk)
+        self.line_count += chunk.count("\n")
+
+        # Trim the oldest lines in one delete
+        excess = self.line_count - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.line_count -= excess
+        self.text.see(tk.END)
+
+    def show(self, entries):
+        # Replace the contents, e.g. with a page loaded from the archive
+        self.clear()
+        self.pending.extend(entries)
+        self.flush()
+
+    def clear(self):
+        self.pending.clear()
+        self.text.delete("1.0", tk.END)
+        self.line_count = 0
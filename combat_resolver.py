@@ -0,0 +1,118 @@
+# combat_resolver.py
+#
+# Works out the result of GameEngine.combat_tick run `ticks` times without
+# stepping through them. A tick is:
+#   - spawn a new enemy if there is none or it is dead (counts as an encounter)
+#   - player hits for max(1, attack - enemy defense)
+#   - if the enemy survived it hits back for max(1, enemy attack - defense)
+#   - the fight stops for good once player health drops to 0
+#
+# Every enemy in a zone has the same stats, so each fresh enemy is the same
+# k-tick cycle costing (k - 1) hits. That makes the whole fight O(1).
+
+import math
+from collections import namedtuple
+
+CombatOutcome = namedtuple("CombatOutcome", [
+    "ticks",          # ticks actually fought
+    "encounters",     # enemies spawned (what the engine counts as enemies_defeated)
+    "kills",          # enemies brought to 0 HP
+    "damage_taken",
+    "health",         # player health afterwards, 0 if died
+    "died",
+    "enemy_health"    # HP left on the enemy being fought, 0 if none
+])
+
+
+def adventure_ticks(zone):
+    # Ticks land every second from the start. The completion is scheduled
+    # first, so it wins a tie and the tick at exactly `time` never runs.
+    return max(0, math.ceil(zone["time"]) - 1)
+
+
+def _fight_one(enemy_health, ticks, health, dmg_out, dmg_in):
+    """Fight a single enemy for at most `ticks` ticks.
+
+    Returns (ticks_used, killed, damage_taken, died, enemy_health_left).
+    """
+    ticks_to_kill = -(-enemy_health // dmg_out)
+    hits_to_die = -(-health // dmg_in)
+
+    # The enemy only hits on ticks it survives: the first ticks_to_kill - 1
+    if hits_to_die <= ticks_to_kill - 1 and hits_to_die <= ticks:
+        return hits_to_die, False, hits_to_die * dmg_in, True, enemy_health - hits_to_die * dmg_out
+    if ticks_to_kill <= ticks:
+        return ticks_to_kill, True, (ticks_to_kill - 1) * dmg_in, False, 0
+    return ticks, False, ticks * dmg_in, False, enemy_health - ticks * dmg_out
+
+
+def resolve_combat(attack, defense, health, enemy_health, enemy_attack, enemy_defense,
+                   ticks, current_enemy_health=0):
+    """Resolve `ticks` combat ticks in closed form.
+
+    current_enemy_health is the HP of an enemy already being fought (0 if a
+    fresh one should be spawned on the first tick).
+    """
+    dmg_out = max(1, attack - enemy_defense)
+    dmg_in = max(1, enemy_attack - defense)
+
+    if ticks <= 0:
+        return CombatOutcome(0, 0, 0, 0, health, False, max(0, current_enemy_health))
+
+    encounters = kills = damage = used = 0
+    target = current_enemy_health
+    if target <= 0:
+        target = enemy_health
+        encounters = 1
+
+    if health <= 0:
+        # Already down: the first tick still swings once, then the fight ends
+        target -= dmg_out
+        if target > 0:
+            damage = dmg_in
+        else:
+            kills = 1
+        return CombatOutcome(1, encounters, kills, damage, 0, True, max(0, target))
+
+    # Finish whatever is being fought (or the first fresh enemy)
+    spent, killed, taken, died, target = _fight_one(target, ticks, health, dmg_out, dmg_in)
+    used += spent
+    damage += taken
+    health -= taken
+    kills += killed
+    if died or not killed or used == ticks:
+        return CombatOutcome(used, encounters, kills, damage, max(0, health), died, target)
+
+    # Whole cycles against fresh enemies
+    cycle_ticks = -(-enemy_health // dmg_out)
+    cycle_damage = (cycle_ticks - 1) * dmg_in
+    cycles = (ticks - used) // cycle_ticks
+    if cycle_damage:
+        # Survive a cycle only while cumulative damage stays below health
+        cycles = min(cycles, (health - 1) // cycle_damage)
+    used += cycles * cycle_ticks
+    damage += cycles * cycle_damage
+    health -= cycles * cycle_damage
+    kills += cycles
+    encounters += cycles
+    if used == ticks:
+        return CombatOutcome(used, encounters, kills, damage, health, False, 0)
+
+    # One last enemy that either outlasts the adventure or kills the player
+    encounters += 1
+    spent, killed, taken, died, target = _fight_one(enemy_health, ticks - used, health, dmg_out, dmg_in)
+    used += spent
+    damage += taken
+    health -= taken
+    kills += killed
+    return CombatOutcome(used, encounters, kills, damage, max(0, health), died, target)
+
+
+def resolve_runs(attack, defense, health, enemy_health, enemy_attack, enemy_defense, ticks, runs):
+    """Outcomes of `runs` back-to-back adventures, carrying health between them."""
+    outcomes = []
+    for _ in range(runs):
+        outcome = resolve_combat(attack, defense, health, enemy_health, enemy_attack, enemy_defense, ticks)
+        health = outcome.health
+        outcomes.append(outcome)
+    return outcomes
@@ -0,0 +1,144 @@
+# game_clock.py
+#
+# Clocks the GameEngine schedules adventures on. Both expose the same small
+# interface: now(), call_at(when, callback, *args) -> handle,
+# call_later(delay, callback, *args) -> handle and cancel(handle).
+#
+# Both keep every pending callback in one deadline queue (a heap keyed by
+# time). SimClock only moves forward when advance() is called, so hours of
+# game time run in milliseconds. TkClock services the queue from the Tk event
+# loop with a single pending after() for the earliest deadline, so nothing
+# ever runs on another thread.
+
+import heapq
+import itertools
+import math
+import time
+
+
+class TimerHandle:
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _DeadlineQueue:
+    def __init__(self):
+        self._queue = []
+        # Ties on time run in the order they were scheduled
+        self._seq = itertools.count()
+
+    def _push(self, when, callback, args):
+        handle = TimerHandle(when, callback, args)
+        heapq.heappush(self._queue, (when, next(self._seq), handle))
+        return handle
+
+    def _run_due(self, until):
+        # Pop and run everything due by `until`, including callbacks that
+        # are scheduled while running
+        queue = self._queue
+        while queue and queue[0][0] <= until:
+            when, _, handle = heapq.heappop(queue)
+            if handle.cancelled:
+                continue
+            self._set_time(when)
+            handle.callback(*handle.args)
+
+    def _set_time(self, when):
+        pass
+
+    def cancel(self, handle):
+        # Cancelled entries stay in the heap and are skipped when popped
+        handle.cancel()
+
+    def pending(self):
+        return sum(1 for _, _, handle in self._queue if not handle.cancelled)
+
+    def next_deadline(self):
+        queue = self._queue
+        while queue and queue[0][2].cancelled:
+            heapq.heappop(queue)
+        return queue[0][0] if queue else None
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.now() + delay, callback, *args)
+
+
+class SimClock(_DeadlineQueue):
+    def __init__(self, start=0.0):
+        super().__init__()
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def _set_time(self, when):
+        self._now = when
+
+    def call_at(self, when, callback, *args):
+        return self._push(max(when, self._now), callback, args)
+
+    def advance(self, seconds):
+        """Run every event due in the next `seconds` of simulated time."""
+        target = self._now + seconds
+        self._run_due(target)
+        self._now = target
+
+    def run_until_idle(self, max_time=None):
+        """Run events until the queue is empty (or max_time is reached)."""
+        self._run_due(float("inf") if max_time is None else max_time)
+        if max_time is not None:
+            self._now = max_time
+
+
+class TkClock(_DeadlineQueue):
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+        self._after_id = None
+        self._armed_for = None
+
+    def now(self):
+        return time.monotonic()
+
+    def call_at(self, when, callback, *args):
+        handle = self._push(when, callback, args)
+        self._arm()
+        return handle
+
+    def _arm(self):
+        # Drop cancelled entries so they don't keep the loop waking up
+        queue = self._queue
+        while queue and queue[0][2].cancelled:
+            heapq.heappop(queue)
+
+        next_when = queue[0][0] if queue else None
+        if next_when == self._armed_for:
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._armed_for = next_when
+        if next_when is not None:
+            # Round up: an early wake-up would find nothing due and spin
+            delay = max(0, math.ceil((next_when - self.now()) * 1000))
+            self._after_id = self.root.after(delay, self._service)
+
+    def _service(self):
+        self._after_id = None
+        self._armed_for = None
+        try:
+            self._run_due(self.now())
+        finally:
+            self._arm()
+
+    def cancel(self, handle):
+        super().cancel(handle)
+        self._arm()
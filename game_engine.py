@@ -0,0 +1,902 @@
+# game_engine.py
+#
+# All of the game rules, with no tkinter dependency. LootSystemGUI is a view
+# over a GameEngine, and the engine can also be driven directly for headless
+# simulations.
+
+import random as rand
+import math
+import heapq
+import itertools
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from game_clock import SimClock
+from combat_resolver import resolve_combat, adventure_ticks
+from loadout_optimizer import DEFAULT_WEIGHTS, best_by_weights, best_for_zone, item_power
+from adventure_registry import AdventureRegistry
+from level_table import LEVELS
+from stat_vector import StatVector, FrozenStatVector
+from combat_events import (CombatEvent, ENTER, ENCOUNTER, HIT, ENEMY_HIT, DEFEAT, COMPLETE,
+                           SKIP, ABANDON, LEVEL_REQUIRED, ADVENTURES_FULL)
+from item_data import ITEMS, ITEM_DETAILS
+from rarity_data import RARITY_MULTIPLIERS, BASE_RARITY_CHANCES, PRICE_MULTIPLIERS
+
+
+CHEST_TIERS = {
+    "Basic": {
+        "price": 100,
+        "rarity_multipliers": {
+            "common": 1.0,      # Base chances
+            "uncommon": 1.0,
+            "rare": 1.0,
+            "epic": 1.0,
+            "legendary": 1.0,
+            "mythic": 1.0,
+            "divine": 1.0,
+            "unspoken": 1.0
+        }
+    },
+    "Advanced": {
+        "price": 500,
+        "rarity_multipliers": {
+            "common": 0.0,      # No common
+            "uncommon": 1.8,
+            "rare": 1.7,
+            "epic": 1.5,
+            "legendary": 1.3,
+            "mythic": 1.2,
+            "divine": 1.1,
+            "unspoken": 1.0
+        }
+    },
+    "Elite": {
+        "price": 2500,
+        "rarity_multipliers": {
+            "common": 0.0,      # No common or uncommon
+            "uncommon": 0.0,
+            "rare": 2.4,
+            "epic": 2.2,
+            "legendary": 1.5,
+            "mythic": 1.5,
+            "divine": 1.3,
+            "unspoken": 1.1
+        }
+    },
+    "Legendary": {
+        "price": 10000,
+        "rarity_multipliers": {
+            "common": 0.0,      # No common, uncommon, or rare
+            "uncommon": 0.0,
+            "rare": 0.0,
+            "epic": 2.6,
+            "legendary": 2.5,
+            "mythic": 1.8,
+            "divine": 1.7,
+            "unspoken": 1.2
+        }
+    }
+}
+
+# Map item types to equipment slots
+TYPE_TO_SLOT = {
+    "armor": "armor",
+    "weapon": "weapon",
+    "staff": "weapon",  # Staff uses weapon slot
+    "shield": "shield",
+    "ring": "ring",
+    "gloves": "gloves",
+    "necklace": "necklace"
+}
+
+
+class GameError(Exception):
+    """An action the player isn't allowed to take right now."""
+
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+def adventure_reward(base, enemies_defeated):
+    # Coins and exp both scale by 20% per enemy
+    return math.floor(base * (1 + enemies_defeated * 0.2))
+
+
+def format_item(rarity, name):
+    return f"{rarity.capitalize()} Item: {name}"
+
+
+def parse_item(item_text):
+    # "Rare Item: Steel Longsword" -> ("rare", "Steel Longsword")
+    rarity = item_text.split(":")[0].lower().replace(" item", "")
+    name = item_text.split(":")[1].strip()
+    return rarity, name
+
+
+_item_types = {}  # (rarity, name) -> item type, filled in as items are looked up
+
+
+def find_item_type(rarity, name):
+    key = (rarity, name)
+    if key not in _item_types:
+        _item_types[key] = next((type_name for type_name, items in ITEMS[rarity].items()
+                                 if any(item_name.lower() in name.lower() for item_name in items)), None)
+    return _item_types[key]
+
+
+class Character:
+    __slots__ = ("level", "exp", "exp_needed", "base_stats", "equipped", "computed_stats", "held_damage")
+
+    def __init__(self):
+        self.level = 1
+        self.exp = 0
+        self.exp_needed = LEVELS.needed(1)
+        self.base_stats = LEVELS.base_stats(1).copy()
+        self.equipped = {
+            "armor": None,
+            "weapon": None,  # This slot will be shared between weapons and staffs
+            "shield": None,
+            "ring": None,
+            "gloves": None,
+            "necklace": None
+        }
+
+        self.computed_stats = self.base_stats.copy()
+        self.held_damage = 0  # damage the 1 HP floor kept off when gear came off
+
+    def equip_item(self, item):
+        slot = TYPE_TO_SLOT.get(item.item_type)
+        if slot:
+            self.unequip(slot)
+            self.equipped[slot] = item
+            self._add_stats(item.stats, 1)
+
+    def unequip(self, slot):
+        item = self.equipped[slot]
+        if item:
+            self.equipped[slot] = None
+            self._add_stats(item.stats, -1)
+        return item
+
+    def _add_stats(self, stats, sign):
+        # Apply one item's stats as a delta instead of recomputing everything
+        computed = self.computed_stats
+        health = computed.health
+        damage = computed.max_health - health
+        if health == 1 and self.held_damage:
+            damage = self.held_damage
+        self.held_damage = 0
+        if sign > 0:
+            computed += stats
+        else:
+            computed -= stats
+
+        # Damage taken carries over, so swapping gear never heals, and
+        # taking gear off never kills (the damage that didn't fit is held
+        # until the gear goes back on)
+        if health > 0:
+            health = computed.max_health - damage
+            if health < 1:
+                self.held_damage = damage
+                health = 1
+            health = min(health, computed.max_health)
+        computed.health = health
+
+    def gain_exp(self, amount):
+        self.exp += amount
+        if self.exp >= self.exp_needed:
+            # Jump straight to the level the total reaches, however many that is
+            level, exp = LEVELS.level_for(LEVELS.total_exp(self.level, self.exp))
+            self.set_level(level, exp)
+
+    def level_up(self):
+        self.set_level(self.level + 1, self.exp - self.exp_needed)
+
+    def set_level(self, level, exp):
+        """Move to `level` with `exp` towards the next one, healed to full."""
+        self.level = level
+        self.exp = exp
+        self.exp_needed = LEVELS.needed(level)
+        new_stats = LEVELS.base_stats(level)
+        self.computed_stats += new_stats - self.base_stats
+        self.base_stats = new_stats.copy()
+
+        self.computed_stats.health = self.computed_stats.max_health
+        self.held_damage = 0
+
+
+# Base stats for each item type, before the rarity multiplier
+ITEM_BASE_STATS = {
+    "armor": StatVector(defense=2, health=10, max_health=10),
+    "weapon": StatVector(attack=8),
+    "staff": StatVector(attack=8),  # Combined weapon/staff slot
+    "shield": StatVector(defense=10),
+    "ring": StatVector(attack=2, defense=4),
+    "gloves": StatVector(attack=4, defense=2),
+    "necklace": StatVector(health=15, max_health=15)
+}
+
+# Stats for every (item type, rarity), shared by all items of that kind
+ITEM_STATS = {
+    (item_type, rarity): FrozenStatVector(*(base * multiplier))
+    for item_type, base in ITEM_BASE_STATS.items()
+    for rarity, multiplier in RARITY_MULTIPLIERS.items()
+}
+
+
+class Item:
+    """An item's name, rarity, type and stats. Items are shared, never modified.
+
+    Use get_item() rather than constructing one, so each (name, rarity)
+    only ever exists once.
+    """
+    __slots__ = ("name", "rarity", "item_type", "level", "details", "stats")
+
+    def __init__(self, name, rarity, item_type):
+        set_field = object.__setattr__
+        set_field(self, "name", name)
+        set_field(self, "rarity", rarity)
+        set_field(self, "item_type", item_type)
+        set_field(self, "level", 1)
+        set_field(self, "details", MappingProxyType(ITEM_DETAILS.get(name, {})))
+        set_field(self, "stats", ITEM_STATS[item_type, rarity])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Item is shared and can't be changed (tried to set {name})")
+
+
+_item_cache = {}
+
+
+def get_item(name, rarity, item_type=None):
+    """The shared Item for (name, rarity), or None if its type isn't known."""
+    item = _item_cache.get((name, rarity))
+    if item is None:
+        item_type = item_type or find_item_type(rarity, name)
+        if not item_type:
+            return None
+        item = _item_cache[name, rarity] = Item(name, rarity, item_type)
+    return item
+
+
+EnemyTemplate = namedtuple("EnemyTemplate", ["level", "max_health", "attack", "defense"])
+
+_enemy_templates = {}
+
+
+def enemy_template(level):
+    """Stats shared by every enemy of a level, worked out once per level."""
+    template = _enemy_templates.get(level)
+    if template is None:
+        template = _enemy_templates[level] = EnemyTemplate(level, 75 * level, 9 * level, 5 * level)
+    return template
+
+
+class Enemy:
+    __slots__ = ("name", "level", "health", "max_health", "attack", "defense")
+
+    def __init__(self, name, level):
+        self.reset(name, enemy_template(level))
+
+    def reset(self, name, template):
+        # Turn this enemy into a fresh one, so dead enemies can be reused
+        self.name = name
+        self.level = template.level
+        self.health = template.max_health
+        self.max_health = template.max_health
+        self.attack = template.attack
+        self.defense = template.defense
+        return self
+
+    def is_alive(self):
+        return self.health > 0
+
+
+class EnemyPool:
+    """Enemies left over from finished adventures, reset for new ones."""
+
+    def __init__(self):
+        self.free = []
+
+    def acquire(self, name, template):
+        if self.free:
+            return self.free.pop().reset(name, template)
+        return Enemy(name, template.level)
+
+    def release(self, enemy):
+        self.free.append(enemy)
+
+
+class Adventure:
+    def __init__(self):
+        self.zones = {
+            "Training Grounds": {
+                "level": 1,
+                "enemies": ["Training Dummy", "Novice Warrior"],
+                "coin_reward": (10, 20),
+                "exp_reward": (20, 40),
+                "time": 15  # seconds
+            },
+            "Forest": {
+                "level": 5,
+                "enemies": ["Wolf", "Bandit", "Dark Elf"],
+                "coin_reward": (40, 80),
+                "exp_reward": (60, 100),
+                "time": 15
+            },
+            "Dark Cave": {
+                "level": 10,
+                "enemies": ["Troll", "Dark Beast", "Shadow Knight"],
+                "coin_reward": (100, 200),
+                "exp_reward": (150, 250),
+                "time": 15
+            },
+            "Dragon's Lair": {
+                "level": 20,
+                "enemies": ["Dragon Cultist", "Dragon Spawn", "Ancient Dragon"],
+                "coin_reward": (300, 600),
+                "exp_reward": (400, 800),
+                "time": 15
+            }
+        }
+        self.current_adventure = None
+        self.timer = None
+
+
+class CombatManager:
+    def __init__(self, zone_name, zone_info, character, rng=rand, pool=None):
+        self.zone_name = zone_name
+        self.zone_info = zone_info
+        self.character = character
+        self.rng = rng
+        self.pool = pool
+        self.enemy_template = enemy_template(zone_info["level"])
+        self.enemies_defeated = 0
+        self.current_enemy = None
+        self.combat_active = False
+        self.next_tick = None  # clock time of this fight's next round
+        self.ends_at = None    # clock time the adventure completes
+        self.scheduled = True  # False when something else (async_runtime) drives it
+        self.adventure_id = None
+        self.events = []       # CombatEvents from this adventure
+
+    def spawn_enemy(self):
+        enemy_name = self.rng.choice(self.zone_info["enemies"])
+        if self.current_enemy is not None:
+            # The old enemy is being replaced, so reuse it
+            return self.current_enemy.reset(enemy_name, self.enemy_template)
+        if self.pool is not None:
+            return self.pool.acquire(enemy_name, self.enemy_template)
+        return Enemy(enemy_name, self.zone_info["level"])
+
+    def is_combat_finished(self):
+        return (not self.current_enemy.is_alive() or
+                self.character.computed_stats.health <= 0)
+
+
+class GameEngine:
+    """Owns the character, inventory, keys and stats and applies every game action.
+
+    What happens on adventures is reported as combat_events.CombatEvent tuples,
+    kept on each adventure's CombatManager.events and passed to on_event(event).
+    Actions the player can't afford raise GameError. Pass seed for a
+    reproducible run.
+
+    Adventures run on `clock` (a SimClock unless one is given), and on_change()
+    is called whenever a scheduled tick or completion has changed the state.
+    """
+
+    def __init__(self, on_event=None, seed=None, clock=None, on_change=None):
+        self.on_event = on_event
+        self.on_change = on_change
+        self.rng = rand.Random(seed)
+        self.clock = clock if clock is not None else SimClock()
+
+        self.character = Character()
+        self.adventure = Adventure()
+        self.chest_tiers = CHEST_TIERS
+        self.items = ITEMS
+        self.price_multipliers = PRICE_MULTIPLIERS
+
+        self.keys = {tier: 0 for tier in self.chest_tiers}  # Starting keys for each tier
+        self.auto_equip = False  # equip chest drops that beat the equipped item
+        self.journal = None      # action_journal.ActionJournal, if state is journaled
+
+        self.max_adventures = 1
+        self.upgrade_cost = 100000
+        self.adventures = AdventureRegistry()  # adventure_id -> CombatManager
+        self.enemy_pool = EnemyPool()
+
+        # One scheduler tick drives every adventure. Completions wait in a
+        # heap of (ends_at, seq, adventure_id) until they're due.
+        self.tick_interval = 1
+        self._completions = []
+        self._completion_seq = itertools.count()
+        self._scheduled = 0  # running adventures the scheduler drives
+        self._tick_handle = None
+        self._tick_time = None
+
+        # starting stats
+        self.stats = {
+            "coins": 2000,
+            "chests_opened": {tier: 0 for tier in self.chest_tiers},  # Track per tier
+            "total_chests_opened": 0,
+            "coins_spent": 0,
+            "items_sold": 0,
+            "coins_earned": 0,
+            "rarities_found": {rarity: 0 for rarity in self.items.keys()},
+            "adventures_completed": 0,
+            "total_enemies_defeated": 0,
+            "total_exp_earned": 0,
+            "active_adventures": 0,
+            "max_adventures": self.max_adventures
+        }
+
+        self.inventory = []
+
+        # Background saves read the inventory list while the game goes on.
+        # While one is pinned, the engine swaps in a copy before changing it.
+        self._inventory_pins = 0
+        self._pin_lock = threading.Lock()
+
+    @property
+    def current_adventures(self):
+        return len(self.adventures)
+
+    def emit(self, kind, zone_name, combat_manager=None, enemy=None, a=0, b=0, c=0):
+        adventure_id = combat_manager.adventure_id if combat_manager else None
+        event = CombatEvent(kind, self.clock.now(), adventure_id, zone_name, enemy, a, b, c)
+        if combat_manager:
+            combat_manager.events.append(event)
+        if self.on_event:
+            self.on_event(event)
+
+    def pin_inventory(self):
+        """The inventory list as it is now, left untouched until unpin_inventory().
+
+        Safe to read from another thread: the engine changes a copy instead.
+        """
+        with self._pin_lock:
+            self._inventory_pins += 1
+            return self.inventory
+
+    def unpin_inventory(self, inventory):
+        with self._pin_lock:
+            if inventory is self.inventory:
+                self._inventory_pins -= 1
+
+    def _writable_inventory(self):
+        # Only this thread adds pins, so seeing none means nobody is reading
+        if self._inventory_pins:
+            with self._pin_lock:
+                if self._inventory_pins:
+                    self.inventory = list(self.inventory)
+                    self._inventory_pins = 0
+        return self.inventory
+
+    def set_inventory(self, items):
+        with self._pin_lock:
+            self.inventory = list(items)
+            self._inventory_pins = 0
+
+    def record(self, action, *args):
+        # Hand a state change to the action journal, if one is attached
+        if self.journal is not None:
+            self.journal.record(action, *args)
+
+    def changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def advance(self, seconds):
+        """Fast-forward a SimClock by `seconds` of game time."""
+        self.clock.advance(seconds)
+
+    ### ECONOMY
+
+    def buy_key(self, tier, amount=1):
+        total_price = self.chest_tiers[tier]["price"] * amount
+
+        if self.stats['coins'] < total_price:
+            raise GameError("Not Enough Coins",
+                            f"You need {total_price} coins to buy {amount} {tier} key(s)!")
+
+        self.stats['coins'] -= total_price
+        self.stats['coins_spent'] += total_price
+        self.keys[tier] += amount
+        self.record("buy_key", tier, amount)
+
+    def sell_item(self, inventory_index):
+        rarity, _ = parse_item(self.inventory[inventory_index])
+        value = self.price_multipliers[rarity]
+
+        self.stats['coins'] += value
+        self.stats['coins_earned'] += value
+        self.stats['items_sold'] += 1
+
+        del self._writable_inventory()[inventory_index]
+        self.record("sell", inventory_index)
+        return value
+
+    def roll_items(self, numItems=1, tier="Basic"):
+        opened_items = []
+        multipliers = self.chest_tiers[tier]["rarity_multipliers"]
+
+        # Adjust chances using multipliers
+        adjusted_chances = {
+            rarity: BASE_RARITY_CHANCES[rarity] * multiplier
+            for rarity, multiplier in multipliers.items()
+        }
+
+        # Remove excluded rarities (multiplier = 0) and normalize remaining chances
+        total_chance = sum(adjusted_chances.values())
+        normalized_chances = {
+            rarity: chance / total_chance for rarity, chance in adjusted_chances.items() if chance > 0
+        }
+
+        # Cumulative probability mapping
+        cumulative = []
+        current = 0.0
+        for rarity, prob in normalized_chances.items():
+            current += prob
+            cumulative.append((current, rarity))
+
+        # Draw items
+        for _ in range(numItems):
+            draw = self.rng.random()
+            rarity = next(r for c, r in cumulative if draw <= c)
+
+            item_type = self.rng.choice(list(self.items[rarity].keys()))
+            item_name = self.rng.choice(self.items[rarity][item_type])
+            opened_items.append(format_item(rarity, item_name))
+
+        return opened_items
+
+    def open_chest(self, tier, amount=1):
+        if self.keys[tier] < amount:
+            raise GameError("Not Enough Keys",
+                            f"You need {amount} {tier} key(s) to open this chest!")
+
+        new_items = self.roll_items(amount, tier)
+        first_index = len(self.inventory)
+        self.receive_chest_items(tier, amount, new_items)
+
+        if self.auto_equip:
+            self.equip_upgrades(first_index)
+        return new_items
+
+    def receive_chest_items(self, tier, amount, new_items):
+        """Spend the keys for `amount` chests and add what they dropped."""
+        self.keys[tier] -= amount
+        self._writable_inventory().extend(new_items)
+
+        # Update stats
+        self.stats['chests_opened'][tier] += amount
+        self.stats['total_chests_opened'] += amount
+
+        # Count rarities
+        for item in new_items:
+            rarity, _ = parse_item(item)
+            self.stats['rarities_found'][rarity] += 1
+
+        self.record("chest", tier, amount, new_items)
+
+    def equip_upgrades(self, first_index=0):
+        """Equip inventory items from first_index on that beat what's equipped.
+
+        Only the best candidate per slot is kept while scanning, so each
+        slot changes at most once however many items there are. Returns
+        the items equipped.
+        """
+        best = {}  # slot -> (power, inventory index, item)
+        for index in range(first_index, len(self.inventory)):
+            rarity, name = parse_item(self.inventory[index])
+            item = get_item(name, rarity)
+            if item is None:
+                continue
+            slot = TYPE_TO_SLOT[item.item_type]
+            power = item_power(item)
+            if slot not in best or power > best[slot][0]:
+                best[slot] = (power, index, item)
+
+        upgrades = []
+        for slot, (power, index, item) in best.items():
+            current = self.character.equipped[slot]
+            if current is None or power > item_power(current):
+                upgrades.append((index, item))
+
+        # Highest index first, so equipping one doesn't shift the others
+        for index, item in sorted(upgrades, key=lambda upgrade: upgrade[0], reverse=True):
+            self.equip_item(index)
+        return [item for _, item in upgrades]
+
+    def upgrade_max_adventures(self):
+        if self.stats['coins'] < self.upgrade_cost:
+            raise GameError("Not Enough Coins",
+                            f"You need {self.upgrade_cost:,} coins to upgrade!")
+
+        self.stats['coins'] -= self.upgrade_cost
+        self.stats['coins_spent'] += self.upgrade_cost
+        self.max_adventures += 1
+        self.stats['max_adventures'] = self.max_adventures
+
+        # Increase by 50% each time
+        self.upgrade_cost = math.floor(self.upgrade_cost * 1.5)
+        self.record("upgrade")
+
+    ### EQUIPMENT
+
+    def equip_item(self, inventory_index):
+        rarity, name = parse_item(self.inventory[inventory_index])
+
+        item = get_item(name, rarity)
+        if item is None:
+            return None
+
+        slot = TYPE_TO_SLOT[item.item_type]
+
+        # If there's already an item equipped, move it to inventory
+        if self.character.equipped[slot]:
+            old_item = self.character.equipped[slot]
+            self._writable_inventory().append(format_item(old_item.rarity, old_item.name))
+
+        self.character.equip_item(item)
+
+        # Remove equipped item from inventory
+        del self._writable_inventory()[inventory_index]
+        self.record("equip", inventory_index)
+        return item
+
+    def unequip_item(self, slot):
+        item = self.character.equipped[slot]
+        if not item:
+            return None
+
+        self._writable_inventory().append(format_item(item.rarity, item.name))
+        self.character.unequip(slot)
+        self.record("unequip", slot)
+        return item
+
+    def equip_preview(self, rarity, name):
+        """How computed stats would change if this item were equipped, or None.
+
+        Works from the shared stat table and what's in the slot now, so it
+        costs the same however much else is going on.
+        """
+        item_type = find_item_type(rarity, name)
+        if item_type is None:
+            return None
+        new_stats = ITEM_STATS[item_type, rarity]
+        current = self.character.equipped[TYPE_TO_SLOT[item_type]]
+        return new_stats - current.stats if current else new_stats.copy()
+
+    def optimize_loadout(self, weights=None, zone_name=None):
+        """Equip the best inventory item for every slot and return the items equipped.
+
+        Best means the highest weighted sum of attack, defense and
+        max_health (weights), or, with zone_name, surviving that zone best.
+        """
+        candidates = {slot: [item] if item else [] for slot, item in self.character.equipped.items()}
+        seen = set()
+        for entry in self.inventory:
+            if entry not in seen:
+                seen.add(entry)
+                rarity, name = parse_item(entry)
+                item = get_item(name, rarity)
+                if item is not None:
+                    candidates[TYPE_TO_SLOT[item.item_type]].append(item)
+
+        if zone_name is not None:
+            zone = self.adventure.zones[zone_name]
+            best = best_for_zone(candidates, self.character.base_stats,
+                                 enemy_template(zone["level"]), adventure_ticks(zone))
+        else:
+            best = best_by_weights(candidates, weights or DEFAULT_WEIGHTS)
+
+        equipped = []
+        for slot, item in best.items():
+            if item is not None and item is not self.character.equipped[slot]:
+                self.equip_item(self.inventory.index(format_item(item.rarity, item.name)))
+                equipped.append(item)
+        return equipped
+
+    ### ADVENTURES
+
+    def start_adventure(self, zone_name, scheduled=True):
+        """Start an adventure and return its id, or None if it can't start.
+
+        With scheduled=False the engine's scheduler leaves it alone and the
+        caller is responsible for its combat ticks and completion.
+        """
+        if self.current_adventures >= self.max_adventures:
+            self.emit(ADVENTURES_FULL, zone_name, a=self.max_adventures)
+            return None
+
+        zone = self.adventure.zones[zone_name]
+
+        # LEVEL REQ.
+        if self.character.level < zone["level"]:
+            self.emit(LEVEL_REQUIRED, zone_name, a=zone['level'])
+            return None
+
+        # Initialize combat manager for this adventure
+        combat_manager = CombatManager(zone_name, zone, self.character, self.rng, self.enemy_pool)
+        combat_manager.combat_active = True
+        now = self.clock.now()
+        combat_manager.next_tick = now + self.tick_interval
+        combat_manager.ends_at = now + zone["time"]
+        combat_manager.scheduled = scheduled
+
+        adventure_id = self.adventures.add(combat_manager)
+        combat_manager.adventure_id = adventure_id
+        self.stats["active_adventures"] = self.current_adventures
+
+        if scheduled:
+            heapq.heappush(self._completions, (combat_manager.ends_at, next(self._completion_seq), adventure_id))
+            self._scheduled += 1
+            self._ensure_ticking()
+
+        self.emit(ENTER, zone_name, combat_manager)
+        return adventure_id
+
+    def _ensure_ticking(self):
+        if self._tick_handle is None:
+            self._tick_time = self.clock.now() + self.tick_interval
+            self._tick_handle = self.clock.call_at(self._tick_time, self._scheduler_tick)
+
+    def _scheduler_tick(self):
+        """Advance every active adventure by one round, then redraw once."""
+        now = self._tick_time
+
+        # Completions first, so a fight never gets a round at its end time
+        completions = self._completions
+        while completions and completions[0][0] <= now:
+            _, _, adventure_id = heapq.heappop(completions)
+            if adventure_id in self.adventures:  # not cancelled or skipped
+                self.complete_adventure(adventure_id)
+
+        for adventure_id, combat_manager in self.adventures.items():
+            if (combat_manager.scheduled and combat_manager.combat_active
+                    and combat_manager.next_tick <= now):
+                combat_manager.next_tick += self.tick_interval
+                self.combat_tick(adventure_id)
+
+        if self._scheduled:
+            self._tick_time += self.tick_interval
+            self._tick_handle = self.clock.call_at(self._tick_time, self._scheduler_tick)
+        else:
+            self._tick_handle = None
+        self.changed()
+
+    def _release(self, adventure_id):
+        combat_manager = self.adventures.remove(adventure_id)
+        combat_manager.combat_active = False
+        self.stats["active_adventures"] = self.current_adventures
+        if combat_manager.current_enemy is not None:
+            self.enemy_pool.release(combat_manager.current_enemy)
+            combat_manager.current_enemy = None
+        if combat_manager.scheduled:
+            self._scheduled -= 1
+
+        # Its completion stays in the heap and is ignored when it comes due,
+        # unless nothing is left for the scheduler to drive
+        if not self._scheduled:
+            self._completions.clear()
+            if self._tick_handle is not None:
+                self.clock.cancel(self._tick_handle)
+                self._tick_handle = None
+        return combat_manager
+
+    def cancel_adventure(self, adventure_id):
+        """Abandon an adventure: no rewards, and it never ticks again."""
+        if adventure_id not in self.adventures:
+            return False
+
+        combat_manager = self._release(adventure_id)
+        self.emit(ABANDON, combat_manager.zone_name, combat_manager)
+        return True
+
+    def skip_adventure(self, adventure_id):
+        """Resolve the rest of an adventure at once and complete it now."""
+        combat_manager = self.adventures.get(adventure_id)
+        if combat_manager is None:
+            return None
+
+        if combat_manager.combat_active:
+            # Rounds still due before the completion (which wins a tie)
+            ticks = max(0, math.ceil(round((combat_manager.ends_at - combat_manager.next_tick)
+                                           / self.tick_interval, 6)))
+            combat_manager.combat_active = False
+
+            character_stats = self.character.computed_stats
+            template = combat_manager.enemy_template
+            enemy = combat_manager.current_enemy
+            outcome = resolve_combat(
+                character_stats.attack, character_stats.defense, character_stats.health,
+                template.max_health, template.attack, template.defense,
+                ticks, enemy.health if enemy else 0
+            )
+
+            character_stats.health = outcome.health
+            combat_manager.enemies_defeated += outcome.encounters
+            if outcome.encounters:
+                combat_manager.current_enemy = combat_manager.spawn_enemy()
+            if combat_manager.current_enemy:
+                combat_manager.current_enemy.health = outcome.enemy_health
+
+            self.emit(SKIP, combat_manager.zone_name, combat_manager,
+                      a=outcome.ticks, b=outcome.kills, c=outcome.damage_taken)
+            if outcome.died:
+                self.emit(DEFEAT, combat_manager.zone_name, combat_manager)
+
+        return self.complete_adventure(adventure_id)
+
+    def combat_tick(self, adventure_id):
+        """Run one round of combat. Returns True while the fight should keep ticking."""
+        combat_manager = self.adventures.get(adventure_id)
+        if combat_manager is None or not combat_manager.combat_active:
+            return False
+
+        character_stats = self.character.computed_stats
+
+        # Spawn new enemy if needed
+        if not combat_manager.current_enemy or not combat_manager.current_enemy.is_alive():
+            combat_manager.current_enemy = combat_manager.spawn_enemy()
+            combat_manager.enemies_defeated += 1
+            self.emit(ENCOUNTER, combat_manager.zone_name, combat_manager, combat_manager.current_enemy.name)
+
+        enemy = combat_manager.current_enemy
+
+        # Player attack
+        damage_to_enemy = max(1, character_stats.attack - enemy.defense)
+        enemy.health -= damage_to_enemy
+        self.emit(HIT, combat_manager.zone_name, combat_manager, enemy.name,
+                  damage_to_enemy, enemy.health, enemy.max_health)
+
+        # Enemy attack if still alive
+        if enemy.is_alive():
+            damage_to_player = max(1, enemy.attack - character_stats.defense)
+            character_stats.health -= damage_to_player
+            self.emit(ENEMY_HIT, combat_manager.zone_name, combat_manager, enemy.name,
+                      damage_to_player, character_stats.health, character_stats.max_health)
+
+        # Check for player death
+        if character_stats.health <= 0:
+            self.emit(DEFEAT, combat_manager.zone_name, combat_manager)
+            combat_manager.combat_active = False
+            character_stats.health = 0
+            return False
+
+        return combat_manager.combat_active
+
+    def complete_adventure(self, adventure_id):
+        if adventure_id not in self.adventures:
+            return None
+
+        combat_manager = self._release(adventure_id)
+        zone = combat_manager.zone_info
+
+        # Calculate and apply rewards
+        base_coins = self.rng.randint(*zone["coin_reward"])
+        base_exp = self.rng.randint(*zone["exp_reward"])
+
+        coins_earned = adventure_reward(base_coins, combat_manager.enemies_defeated)
+        exp_earned = adventure_reward(base_exp, combat_manager.enemies_defeated)
+        self.receive_rewards(coins_earned, exp_earned, combat_manager.enemies_defeated)
+
+        self.emit(COMPLETE, combat_manager.zone_name, combat_manager,
+                  a=combat_manager.enemies_defeated, b=coins_earned, c=exp_earned)
+
+        return coins_earned, exp_earned
+
+    def receive_rewards(self, coins, exp, enemies_defeated):
+        """Credit a finished adventure's rewards."""
+        self.stats['coins'] += coins
+        self.stats['coins_earned'] += coins
+        self.stats['adventures_completed'] += 1
+        self.stats['total_enemies_defeated'] += enemies_defeated
+        self.stats['total_exp_earned'] += exp
+        self.character.gain_exp(exp)
+        self.record("rewards", coins, exp, enemies_defeated)
@@ -1,26 +1,171 @@
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageDraw, ImageFont
+import hashlib
+import json
 import os
 
+from asset_manifest import manifest_paths
+from rarity_data import RARITY_COLORS
+
+# Bump when render_placeholder changes so old cached icons are not reused
+PLACEHOLDER_VERSION = 1
+PLACEHOLDER_CACHE = ".cache/placeholders"
+
+_SMALL_WORDS = {"of", "the", "a", "an"}
+
+
+def item_initials(name):
+    words = [w for w in name.split() if w.lower() not in _SMALL_WORDS] or name.split()
+    if len(words) == 1:
+        return words[0][:2].upper()
+    return (words[0][0] + words[-1][0]).upper()
+
+
+def _mix(color, target, t):
+    # Blend a "#rrggbb" color towards an (r, g, b) target by t in [0, 1]
+    rgb = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return tuple(int(c + (tc - c) * t) for c, tc in zip(rgb, target)) + (255,)
+
+
+def _draw_glyph(draw, item_type, box, color):
+    # Simple line-art silhouette per item type, drawn into box (x0, y0, x1, y1)
+    x0, y0, x1, y1 = box
+    w, h = x1 - x0, y1 - y0
+    cx, cy = x0 + w / 2, y0 + h / 2
+    line = max(2, w // 12)
+
+    if item_type == "weapon":
+        draw.line([(x0 + w * 0.2, y1 - h * 0.2), (x1 - h * 0.15, y0 + h * 0.15)], fill=color, width=line)
+        draw.line([(x0 + w * 0.15, y1 - h * 0.45), (x0 + w * 0.45, y1 - h * 0.15)], fill=color, width=line)
+    elif item_type == "staff":
+        draw.line([(cx, y0 + h * 0.3), (cx, y1)], fill=color, width=line)
+        r = w * 0.15
+        draw.ellipse([cx - r, y0 + h * 0.3 - 2 * r, cx + r, y0 + h * 0.3], outline=color, width=line)
+    elif item_type == "armor":
+        draw.polygon([(x0 + w * 0.15, y0 + h * 0.15), (x0 + w * 0.35, y0), (cx, y0 + h * 0.15),
+                      (x1 - w * 0.35, y0), (x1 - w * 0.15, y0 + h * 0.15), (x1 - w * 0.25, y1),
+                      (x0 + w * 0.25, y1)], outline=color, width=line)
+    elif item_type == "shield":
+        draw.polygon([(x0 + w * 0.15, y0), (x1 - w * 0.15, y0), (x1 - w * 0.15, cy),
+                      (cx, y1), (x0 + w * 0.15, cy)], outline=color, width=line)
+    elif item_type == "ring":
+        draw.ellipse([x0 + w * 0.2, y0 + h * 0.25, x1 - w * 0.2, y1 - h * 0.05], outline=color, width=line)
+        draw.polygon([(cx - w * 0.1, y0 + h * 0.25), (cx, y0), (cx + w * 0.1, y0 + h * 0.25)], fill=color)
+    elif item_type == "gloves":
+        draw.rounded_rectangle([x0 + w * 0.25, y0 + h * 0.3, x1 - w * 0.2, y1], radius=w * 0.1,
+                               outline=color, width=line)
+        for i in range(3):
+            fx = x0 + w * (0.3 + i * 0.15)
+            draw.line([(fx, y0 + h * 0.3), (fx, y0 + h * 0.05)], fill=color, width=line)
+    elif item_type == "necklace":
+        draw.arc([x0 + w * 0.1, y0 - h * 0.4, x1 - w * 0.1, y1 - h * 0.2], 20, 160, fill=color, width=line)
+        r = w * 0.12
+        draw.ellipse([cx - r, y1 - h * 0.3 - r, cx + r, y1 - h * 0.3 + r], fill=color)
+    else:
+        draw.rectangle([x0 + w * 0.2, y0 + h * 0.2, x1 - w * 0.2, y1 - h * 0.2], outline=color, width=line)
+
+
+def render_placeholder(name, rarity, item_type, size=(64, 64)):
+    """Draw a stand-in icon: rarity border, type glyph and the item's initials."""
+    color = RARITY_COLORS.get(rarity, "#808080")
+    w, h = size
+    border = max(2, w // 16)
+
+    image = Image.new("RGBA", size, _mix(color, (0, 0, 0), 0.75))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, w - 1, h - 1], outline=color, width=border)
+
+    glyph_box = (w * 0.2, h * 0.12, w * 0.8, h * 0.62)
+    _draw_glyph(draw, item_type, tuple(int(v) for v in glyph_box), _mix(color, (255, 255, 255), 0.35))
+
+    try:
+        font = ImageFont.load_default(size=max(10, h // 4))
+    except TypeError:  # Pillow < 10.1 has no sized default font
+        font = ImageFont.load_default()
+    text = item_initials(name)
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    draw.text(((w - (right - left)) / 2 - left, h * 0.66 - top), text, font=font, fill="#ffffff")
+    return image
+
+
 class ImageManager:
     def __init__(self):
         self.images = {}
+        self.image_paths = {}
+        self.item_info = {}  # name -> (rarity, type) for placeholders
+        self.placeholder_dir = None
         self.default_image = None
-        
+        self.size = (64, 64)
+
     def load_images(self, image_mappings, size=(64, 64)):
-        for item_name, image_path in image_mappings.items():
-            try:
-                image = Image.open(image_path)
-                image = image.resize(size)
-                self.images[item_name] = ImageTk.PhotoImage(image)
-            except Exception as e:
-                print(f"Failed to load image for {item_name}: {e}")
-                
+        # Only remember the paths here, images are decoded the first time
+        # they are shown so startup cost doesn't grow with the asset count
+        self.size = size
+        self.image_paths.update(image_mappings)
+
         # Load default image for items without specific images
         try:
             default_image = Image.open("assets/images/items/missingTex.png")
             self.default_image = ImageTk.PhotoImage(default_image.resize(size))
         except:
             print("Failed to load default image")
-    
+
+    def load_manifest(self, manifest, size=(64, 64)):
+        self.load_images(manifest_paths(manifest), size)
+
+    def register_catalog(self, catalog):
+        # catalog is rarity -> type -> [names], placeholders are generated for
+        # every item in it that has no image of its own
+        self.item_info = {
+            name: (rarity, item_type)
+            for rarity, types in catalog.items()
+            for item_type, names in types.items()
+            for name in names
+        }
+        # One cache folder per catalog version, so a changed catalog (or
+        # renderer) never picks up stale icons
+        key = json.dumps([PLACEHOLDER_VERSION, self.size, RARITY_COLORS, sorted(self.item_info.items())])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        self.placeholder_dir = os.path.join(PLACEHOLDER_CACHE, digest)
+
+    def _placeholder(self, item_name):
+        rarity, item_type = self.item_info[item_name]
+        filename = hashlib.sha1(item_name.encode("utf-8")).hexdigest()[:16] + ".png"
+        path = os.path.join(self.placeholder_dir, filename)
+
+        try:
+            return Image.open(path)
+        except OSError:
+            pass
+
+        image = render_placeholder(item_name, rarity, item_type, self.size)
+        try:
+            os.makedirs(self.placeholder_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            image.save(tmp_path, format="PNG")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to cache placeholder for {item_name}: {e}")
+        return image
+
     def get_image(self, item_name):
-        return self.images.get(item_name, self.default_image)
\ No newline at end of file
+        image = self.images.get(item_name)
+        if image is not None:
+            return image
+
+        image_path = self.image_paths.get(item_name)
+        if image_path is None:
+            if item_name not in self.item_info:
+                return self.default_image
+            self.images[item_name] = ImageTk.PhotoImage(self._placeholder(item_name))
+            return self.images[item_name]
+
+        try:
+            image = Image.open(image_path)
+            image = image.resize(self.size)
+            self.images[item_name] = ImageTk.PhotoImage(image)
+        except Exception as e:
+            print(f"Failed to load image for {item_name}: {e}")
+            # Don't retry a broken file on every redraw
+            del self.image_paths[item_name]
+            return self.get_image(item_name)
+        return self.images[item_name]
@@ -0,0 +1,58 @@
+# level_table.py
+#
+# Exp thresholds and base stats for every level, built on demand. Levelling
+# floors exp_needed * 1.5 and every base stat * 1.1 once per level, so the
+# values for a level only depend on the one before it and can be worked out
+# once and shared. With cumulative thresholds, finding the level a total exp
+# amount reaches is a binary search instead of one level_up per level.
+
+import bisect
+import math
+
+from stat_vector import StatVector
+
+BASE_EXP_NEEDED = 100
+BASE_STATS = StatVector(attack=10, defense=10, health=100, max_health=100)
+
+
+class LevelTable:
+    def __init__(self, base_stats=BASE_STATS, exp_needed=BASE_EXP_NEEDED):
+        # Indexed by level; level 0 is unused
+        self.thresholds = [0, 0]            # total exp needed to reach the level
+        self.exp_needed = [0, exp_needed]   # exp from this level to the next
+        self.stats = [None, base_stats.copy()]
+
+    def _extend(self):
+        level = len(self.stats) - 1
+        self.thresholds.append(self.thresholds[level] + self.exp_needed[level])
+        self.exp_needed.append(math.floor(self.exp_needed[level] * 1.5))
+        stats = StatVector(*(math.floor(value * 1.1) for value in self.stats[level]))
+        stats.health = stats.max_health
+        self.stats.append(stats)
+
+    def _ensure(self, level):
+        while len(self.stats) <= level:
+            self._extend()
+
+    def base_stats(self, level):
+        self._ensure(level)
+        return self.stats[level]
+
+    def needed(self, level):
+        self._ensure(level)
+        return self.exp_needed[level]
+
+    def total_exp(self, level, exp):
+        """Exp earned since level 1 by a character at `level` with `exp` towards the next."""
+        self._ensure(level)
+        return self.thresholds[level] + exp
+
+    def level_for(self, total_exp):
+        """The level reached with `total_exp` exp, and the exp left over towards the next."""
+        while self.thresholds[-1] <= total_exp:
+            self._extend()
+        level = bisect.bisect_right(self.thresholds, total_exp, 1) - 1
+        return level, total_exp - self.thresholds[level]
+
+
+LEVELS = LevelTable()
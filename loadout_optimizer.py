@@ -0,0 +1,76 @@
+# loadout_optimizer.py
+#
+# Picks the best item for every equipment slot. Candidates are first pruned
+# per slot to a Pareto front over attack, defense and max_health: an item
+# that another candidate beats or ties in all three can never be the better
+# pick. Items of the same type and rarity share stats, so even a huge
+# inventory comes down to a handful of candidates per slot.
+#
+# Two objectives:
+#   - weights: maximize a weighted sum of attack, defense and max_health.
+#     That's separable, so each slot is picked on its own.
+#   - a zone: maximize back-to-back adventures survived (then enemies
+#     met, then health left), checked with the combat resolver over every
+#     combination of the per-slot fronts.
+
+import itertools
+
+from combat_resolver import resolve_runs
+
+DEFAULT_WEIGHTS = {"attack": 1, "defense": 1, "max_health": 1}
+
+
+def _key(item):
+    stats = item.stats
+    return stats.attack, stats.defense, stats.max_health
+
+
+def pareto_front(items):
+    """Items no other item matches or beats in attack, defense and max_health."""
+    front = []
+    # After sorting best-first only an earlier item can dominate a later one.
+    # Item health always equals max_health, so comparing whole vectors is
+    # the same as comparing the three stats.
+    for item in sorted(items, key=_key, reverse=True):
+        if not any(kept.stats >= item.stats for kept in front):
+            front.append(item)
+    return front
+
+
+def item_power(item, weights=DEFAULT_WEIGHTS):
+    """Weighted sum of an item's attack, defense and max_health."""
+    stats = item.stats
+    return (weights.get("attack", 0) * stats.attack + weights.get("defense", 0) * stats.defense
+            + weights.get("max_health", 0) * stats.max_health)
+
+
+def best_by_weights(candidates, weights=DEFAULT_WEIGHTS):
+    """slot -> the candidate with the highest weighted score (None if no candidates)."""
+    return {slot: max(pareto_front(items), key=lambda item: item_power(item, weights), default=None)
+            for slot, items in candidates.items()}
+
+
+def best_for_zone(candidates, base_stats, enemy, ticks, runs=10):
+    """slot -> candidate, for the combination that survives `enemy` best.
+
+    base_stats are the character's stats without gear. The first run starts
+    from full health and each later one from the health the one before it
+    left, like back-to-back adventures in the game.
+    """
+    slots = list(candidates)
+    fronts = [pareto_front(candidates[slot]) or [None] for slot in slots]
+
+    best, best_score = None, None
+    for combination in itertools.product(*fronts):
+        stats = base_stats.copy()
+        for item in combination:
+            if item is not None:
+                stats += item.stats
+        outcomes = resolve_runs(stats.attack, stats.defense, stats.max_health,
+                                enemy.max_health, enemy.attack, enemy.defense, ticks, runs)
+        score = (sum(not outcome.died for outcome in outcomes),
+                 sum(outcome.encounters for outcome in outcomes),
+                 outcomes[-1].health if outcomes else stats.max_health)
+        if best_score is None or score > best_score:
+            best, best_score = combination, score
+    return dict(zip(slots, best))
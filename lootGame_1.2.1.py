@@ -1,387 +1,69 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random as rand
-from threading import Timer
-import math
-from item_data import ITEM_IMAGES, ITEM_DETAILS
+import asyncio
+import sys
+from item_data import ITEM_MANIFEST, ITEM_DETAILS
 from image_manager import ImageManager
-from rarity_data import RARITY_COLORS, RARITY_MULTIPLIERS
-
-
-class Character:
-    def __init__(self):
-        self.level = 1
-        self.exp = 0
-        self.exp_needed = 100
-        self.base_stats = {
-            "attack": 10,
-            "defense": 10,
-            "health": 100,
-            "max_health": 100
-        }
-        self.equipped = {
-            "armor": None,
-            "weapon": None,  # This slot will be shared between weapons and staffs
-            "shield": None,
-            "ring": None,
-            "gloves": None,
-            "necklace": None
-        }
-
-        self.computed_stats = self.base_stats.copy()
-
-    def equip_item(self, item):
-        # Map item types to slots
-        type_to_slot = {
-            "armor": "armor",
-            "weapon": "weapon",
-            "staff": "weapon",  # Staff uses weapon slot
-            "shield": "shield",
-            "ring": "ring",
-            "gloves": "gloves",
-            "necklace": "necklace"
-        }
-        
-        slot = type_to_slot.get(item.item_type)
-        if slot:
-            self.equipped[slot] = item
-            self.compute_stats()
-
-    def compute_stats(self):
-        self.computed_stats = self.base_stats.copy()
-        for item in self.equipped.values():
-            if item:
-                for stat, value in item.stats.items():
-                    self.computed_stats[stat] += value
-
-    def gain_exp(self, amount):
-        self.exp += amount
-        while self.exp >= self.exp_needed:
-            self.level_up()
-
-    def level_up(self):
-        self.exp -= self.exp_needed
-        self.level += 1
-        self.exp_needed = math.floor(self.exp_needed * 1.5)
-        for stat in self.base_stats:
-            self.base_stats[stat] = math.floor(self.base_stats[stat] * 1.1)
-        self.compute_stats()
-        self.base_stats["health"] = self.base_stats["max_health"]
-
-class Item:
-    def __init__(self, name, rarity, item_type):
-        self.name = name
-        self.rarity = rarity
-        self.item_type = item_type
-        self.level = 1
-        
-        multiplier = RARITY_MULTIPLIERS[rarity]
-        
-        # Get item details if available
-        self.details = ITEM_DETAILS.get(name, {})
-
-        
-        # Base stats for each item type
-        if item_type == "armor":
-            self.stats = {
-                "max_health": 10 * multiplier,
-                "health": 10 * multiplier,
-                "defense": 2 * multiplier
-            }
-        elif item_type in ["weapon", "staff"]:  # Combined weapon/staff slot
-            self.stats = {
-                "attack": 8 * multiplier
-            }
-        elif item_type == "shield":
-            self.stats = {
-                "defense": 10 * multiplier,
-            }
-        elif item_type == "ring":
-            self.stats = {
-                "attack": 2 * multiplier,
-                "defense": 4 * multiplier
-            }
-        elif item_type == "gloves":
-            self.stats = {
-                "attack": 4 * multiplier,
-                "defense": 2 * multiplier
-            }
-        elif item_type == "necklace":
-            self.stats = {
-                "max_health": 15 * multiplier,
-                "health": 15 * multiplier
-            }
-
-
-class Enemy:
-    def __init__(self, name, level):
-        self.name = name
-        self.level = level
-        self.health = 75 * level
-        self.max_health = 75 * level
-        self.attack = 9 * level
-        self.defense = 5 * level
-
-    def is_alive(self):
-        return self.health > 0
-
-
-class Adventure:
-    def __init__(self):
-        self.zones = {
-            "Training Grounds": {
-                "level": 1,
-                "enemies": ["Training Dummy", "Novice Warrior"],
-                "coin_reward": (10, 20),
-                "exp_reward": (20, 40),
-                "time": 15  # seconds
-            },
-            "Forest": {
-                "level": 5,
-                "enemies": ["Wolf", "Bandit", "Dark Elf"],
-                "coin_reward": (40, 80),
-                "exp_reward": (60, 100),
-                "time": 15
-            },
-            "Dark Cave": {
-                "level": 10,
-                "enemies": ["Troll", "Dark Beast", "Shadow Knight"],
-                "coin_reward": (100, 200),
-                "exp_reward": (150, 250),
-                "time": 15
-            },
-            "Dragon's Lair": {
-                "level": 20,
-                "enemies": ["Dragon Cultist", "Dragon Spawn", "Ancient Dragon"],
-                "coin_reward": (300, 600),
-                "exp_reward": (400, 800),
-                "time": 15
-            }
-        }
-        self.current_adventure = None
-        self.timer = None
-
-
-class CombatManager:
-    def __init__(self, zone_name, zone_info, character):
-        self.zone_name = zone_name
-        self.zone_info = zone_info
-        self.character = character
-        self.enemies_defeated = 0
-        self.current_enemy = None
-        self.combat_active = False
-        
-    def spawn_enemy(self):
-        enemy_name = rand.choice(self.zone_info["enemies"])
-        return Enemy(enemy_name, self.zone_info["level"])
-    
-    def is_combat_finished(self):
-        return (not self.current_enemy.is_alive() or 
-                self.character.computed_stats["health"] <= 0)
+from rarity_data import RARITY_COLORS
+from game_engine import GameEngine, GameError, parse_item, find_item_type
+from game_clock import TkClock
+from async_runtime import AsyncioClock, AdventureRuntime, run_tk
+from combat_log import CombatLogView
+from combat_events import format_event
+from combat_archive import CombatArchive
+from action_journal import ActionJournal
+from autosave import BackgroundSaver
 
 
 class LootSystemGUI(tk.Frame):
-    def __init__(self, root):
+    def __init__(self, root, clock=None):
         super().__init__(root)
         self.root = root
         self.root.title("Advanced Loot System")
         self.root.geometry("1200x800")
-        self.character = Character()
-        self.adventure = Adventure()
-
-        self.chest_tiers = {
-            "Basic": {
-                "price": 100,
-                "rarity_multipliers": {
-                    "common": 1.0,      # Base chances
-                    "uncommon": 1.0,
-                    "rare": 1.0,
-                    "epic": 1.0,
-                    "legendary": 1.0,
-                    "mythic": 1.0,
-                    "divine": 1.0,
-                    "unspoken": 1.0
-                }
-            },
-            "Advanced": {
-                "price": 500,
-                "rarity_multipliers": {
-                    "common": 0.0,      # No common
-                    "uncommon": 1.8,
-                    "rare": 1.7,
-                    "epic": 1.5,
-                    "legendary": 1.3,
-                    "mythic": 1.2,
-                    "divine": 1.1,
-                    "unspoken": 1.0
-                }
-            },
-            "Elite": {
-                "price": 2500,
-                "rarity_multipliers": {
-                    "common": 0.0,      # No common or uncommon
-                    "uncommon": 0.0,
-                    "rare": 2.4,
-                    "epic": 2.2,
-                    "legendary": 1.5,
-                    "mythic": 1.5,
-                    "divine": 1.3,
-                    "unspoken": 1.1
-                }
-            },
-            "Legendary": {
-                "price": 10000,
-                "rarity_multipliers": {
-                    "common": 0.0,      # No common, uncommon, or rare 
-                    "uncommon": 0.0,
-                    "rare": 0.0,
-                    "epic": 2.6,
-                    "legendary": 2.5,
-                    "mythic": 1.8,
-                    "divine": 1.7,
-                    "unspoken": 1.2
-                }
-            }
-        }
-
+        # Adventures tick in real time on the Tk loop unless another clock is given
+        self.engine = GameEngine(on_event=self.add_to_combat_log,
+                                 clock=clock if clock is not None else TkClock(root),
+                                 on_change=self.on_engine_update)
+        self.runtime = None  # AdventureRuntime when running under asyncio
 
-        self.keys = {tier: 0 for tier in self.chest_tiers}  # Starting keys for each tier
-        
-
-        # Price multipliers for each rarity
-        self.price_multipliers = {
-            "common": 10,
-            "uncommon": 25,
-            "rare": 75,
-            "epic": 200,
-            "legendary": 500,
-            "mythic": 1500,
-            "divine": 5000,
-            "unspoken": 15000
-        }
-        
         # Rarity colors
-        self.rarity_colors = {
-            "common": "#808080",      # Gray
-            "uncommon": "#00FF00",    # Green
-            "rare": "#0000FF",        # Blue
-            "epic": "#800080",        # Purple
-            "legendary": "#FFA500",   # Orange
-            "mythic": "#FF0000",      # Red
-            "divine": "#FFB6C1",      # Light Pink
-            "unspoken": "#FF1493"     # Deep Pink
-        }
-        
-        self.items = {
-            "common": {
-                "weapon": ["Wooden Sword", "Wooden Axe", "Wooden Mace"],
-                "armor": ["Wooden Armor", "Leather Armor", "Cotton Robes"],
-                "shield": ["Wooden Shield", "Leather Shield"],
-                "staff": ["Apprentice Staff", "Wooden Wand"],
-                "ring": ["Copper Ring", "Wooden Ring"],
-                "gloves": ["Leather Gloves", "Cotton Gloves"],
-                "necklace": ["Hemp Necklace", "Wooden Pendant"]
-            },
-            "uncommon": {
-                "weapon": ["Iron Sword", "Bronze Axe", "Steel Mace"],
-                "armor": ["Iron Chestplate", "Padded Leather Armor", "Hardened Robes"],
-                "shield": ["Iron Shield", "Reinforced Leather Shield"],
-                "staff": ["Initiate Staff", "Oak Wand"],
-                "ring": ["Bronze Ring", "Iron Band"],
-                "gloves": ["Iron Gauntlets", "Stitched Leather Gloves"],
-                "necklace": ["Copper Chain", "Iron Pendant"]
-            },
-            "rare": {
-                "weapon": ["Steel Longsword", "Runed Battleaxe", "Spiked Morningstar"],
-                "armor": ["Steel Armor", "Enchanted Leather Vest", "Silken Robes"],
-                "shield": ["Steel Shield", "Runed Buckler"],
-                "staff": ["Mage’s Staff", "Crystal Wand"],
-                "ring": ["Silver Ring", "Runed Band"],
-                "gloves": ["Steel Gauntlets", "Silken Gloves"],
-                "necklace": ["Silver Amulet", "Crystal Pendant"]
-            },
-            "epic": {
-                "weapon": ["Fiery Blade", "Shadow Cleaver", "Thunder Hammer"],
-                "armor": ["Dragonhide Vest", "Shadowforged Plate", "Mystic Robes"],
-                "shield": ["Dragon Scale Shield", "Aegis of Shadows"],
-                "staff": ["Arcane Staff", "Eldritch Wand"],
-                "ring": ["Ring of Flames", "Moonstone Band"],
-                "gloves": ["Gauntlets of Power", "Spellwoven Gloves"],
-                "necklace": ["Amulet of the Phoenix", "Runed Locket"]
-            },
-            "legendary": {
-                "weapon": ["Sword of Heroes", "Axe of the Forgotten King", "Hammer of the Titans"],
-                "armor": ["Celestial Plate", "Eternal Vestments", "Dragonweave Robes"],
-                "shield": ["Aegis of Eternity", "Shield of the Colossus"],
-                "staff": ["Staff of the Archmage", "Wand of Infinite Wisdom"],
-                "ring": ["Ring of the Ancients", "Band of Eternity"],
-                "gloves": ["Gloves of the Flamekeeper", "Voidforged Gauntlets"],
-                "necklace": ["Necklace of Everlasting Light", "Amulet of the Eternal"]
-            },
-            "mythic": {
-                "weapon": ["Blade of Infinite Stars", "Axe of the Cosmos", "Hammer of Eternal Fury"],
-                "armor": ["Armor of the Void", "Cosmic Vestments", "Robes of the Archon"],
-                "shield": ["Barrier of Infinity", "Bulwark of the Eternal"],
-                "staff": ["Staff of the Voidseer", "Wand of the Cosmos"],
-                "ring": ["Mythril Ring", "Band of Infinity"],
-                "gloves": ["Gauntlets of the Cosmos", "Gloves of the Unseen"],
-                "necklace": ["Pendant of Infinity", "Amulet of the Beyond"]
-            },
-            "divine": {
-                "weapon": ["Heavenly Blade", "Axe of Divine Wrath", "Hammer of the Holy"],
-                "armor": ["Raiment of the Heavens", "Divine Plate", "Robes of the Seraphim"],
-                "shield": ["Shield of the Archangel", "Aegis of Divinity"],
-                "staff": ["Staff of Celestial Power", "Wand of the Seraph"],
-                "ring": ["Halo Ring", "Celestial Band"],
-                "gloves": ["Gloves of Divinity", "Gauntlets of the Heavens"],
-                "necklace": ["Amulet of the Angels", "Necklace of Celestial Grace"]
-            },
-            "unspoken": {
-                "weapon": ["Nameless Blade", "Axe of the Unseen", "Hammer of Forgotten Oaths"],
-                "armor": ["Shroud of the Unspoken", "Armor of the Veil", "Ethereal Robes"],
-                "shield": ["Shield of Silent Promises", "Aegis of Whispers"],
-                "staff": ["Staff of the Nameless", "Wand of Eternal Mystery"],
-                "ring": ["Ring of the Unknown", "Band of Silent Eternity"],
-                "gloves": ["Veiled Gauntlets", "Gloves of Hidden Truths"],
-                "necklace": ["Necklace of the Forgotten", "Amulet of the Unspoken"]
-            }
-        }
+        self.rarity_colors = RARITY_COLORS
         
         # Initialize image manager
         self.image_manager = ImageManager()
-        self.image_manager.load_images(ITEM_IMAGES)
+        self.image_manager.load_manifest(ITEM_MANIFEST)
+        self.image_manager.register_catalog(self.items)
 
         # Initialize inventory grid
         self.inventory_size = 1  # Maximum number of items
         self.items_per_row = 10  # Number of items per row
         self.inventory_buttons = []  # Store inventory button widgets
 
-    
-        
+        # Lines kept in the combat log widget
+        self.combat_log_lines = 1000
+
+        # Full history lives on disk, the widget shows one page of it
+        self.combat_archive = CombatArchive()
+        self.log_page_size = 200
+        self.log_zone = None       # None shows every zone
+        self.log_live = True       # False while browsing older pages
+        self.log_first_id = None
+        self.log_last_id = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Pick up where the last session left off; from here on every action
+        # is journaled, so a crash loses at most the last unsynced batch.
+        # Snapshots are written by a background thread.
+        self.saver = BackgroundSaver(self.engine)
+        self.journal = ActionJournal(self.engine, saver=self.saver)
+        self.autosave_ms = 60000
+        try:
+            loaded = self.journal.open()
+        except GameError as e:
+            messagebox.showwarning(e.title, e.message)
+            loaded = True  # show whatever was restored before the error
 
-        self.max_adventures = 1
-        self.current_adventures = 0
-        self.upgrade_cost = 100000
-        self.active_adventures = {}  # Store active adventure information
-        self.combat_managers = {}    # Store combat managers for each active adventure
-
-        # starting stats
-        self.stats = {
-            "coins": 2000,
-            "chests_opened": {tier: 0 for tier in self.chest_tiers},  # Track per tier
-            "total_chests_opened": 0,
-            "coins_spent": 0,
-            "items_sold": 0,
-            "coins_earned": 0,
-            "rarities_found": {rarity: 0 for rarity in self.items.keys()},
-            "adventures_completed": 0,
-            "total_enemies_defeated": 0,
-            "total_exp_earned": 0,
-            "active_adventures": 0,
-            "max_adventures": self.max_adventures
-        }
-        
-        self.inventory = []
         self.create_widgets()
         self.update_counters()
         self.create_context_menu()
@@ -391,6 +73,54 @@ class LootSystemGUI(tk.Frame):
         self.filtered_items = []
         self.filtered_indices = []
 
+        if loaded:
+            self.update_equipment_display()
+            self.update_inventory_display()
+            self.update_character_display()
+            self.update_stats_display()
+        self.root.after(self.autosave_ms, self.autosave)
+
+    # The view reads game state straight from the engine
+    @property
+    def character(self):
+        return self.engine.character
+
+    @property
+    def adventure(self):
+        return self.engine.adventure
+
+    @property
+    def chest_tiers(self):
+        return self.engine.chest_tiers
+
+    @property
+    def items(self):
+        return self.engine.items
+
+    @property
+    def keys(self):
+        return self.engine.keys
+
+    @property
+    def stats(self):
+        return self.engine.stats
+
+    @property
+    def inventory(self):
+        return self.engine.inventory
+
+    @property
+    def max_adventures(self):
+        return self.engine.max_adventures
+
+    @property
+    def current_adventures(self):
+        return self.engine.current_adventures
+
+    @property
+    def upgrade_cost(self):
+        return self.engine.upgrade_cost
+
     ### WIDGETS UI STUFF
     def create_widgets(self):
         # Configure root grid
@@ -484,7 +214,10 @@ class LootSystemGUI(tk.Frame):
         # Bulk opening toggle
         self.bulk_var = tk.BooleanVar(value=False)
         self.bulk_check = ttk.Checkbutton(chest_inner_frame, text="Open 10x", variable=self.bulk_var)
-        self.bulk_check.grid(row=0, column=0, columnspan=4, pady=5)
+        self.bulk_check.grid(row=0, column=0, columnspan=2, pady=5)
+        self.auto_equip_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(chest_inner_frame, text="Auto-equip upgrades", variable=self.auto_equip_var,
+                        command=self.toggle_auto_equip).grid(row=0, column=2, columnspan=2, pady=5)
 
         # Header labels
         ttk.Label(chest_inner_frame, text="Tier", width=15).grid(row=1, column=0, padx=5, sticky="ew")
@@ -594,18 +327,14 @@ class LootSystemGUI(tk.Frame):
 
     
     def buy_key(self, tier):
-        price = self.chest_tiers[tier]["price"]
         amount = 10 if self.bulk_var.get() else 1
-        total_price = price * amount
         
-        if self.stats['coins'] >= total_price:
-            self.stats['coins'] -= total_price
-            self.stats['coins_spent'] += total_price
-            self.keys[tier] += amount
-            self.update_stats_display()  # Changed from update_economy_display
-        else:
-            messagebox.showwarning("Not Enough Coins", 
-                                f"You need {total_price} coins to buy {amount} {tier} key(s)!")
+        try:
+            self.engine.buy_key(tier, amount)
+        except GameError as e:
+            messagebox.showwarning(e.title, e.message)
+            return
+        self.update_stats_display()  # Changed from update_economy_display
             
             
     def sell_items(self):
@@ -613,17 +342,7 @@ class LootSystemGUI(tk.Frame):
             return
         
         inventory_index = self.filtered_indices[self.selected_item_index]
-        item = self.inventory[inventory_index]
-        rarity = item.split(":")[0].lower().replace(" item", "")
-        value = self.price_multipliers[rarity]
-        
-        # Update stats
-        self.stats['coins'] += value
-        self.stats['coins_earned'] += value
-        self.stats['items_sold'] += 1
-        
-        # Remove item
-        del self.inventory[inventory_index]
+        value = self.engine.sell_item(inventory_index)
         self.selected_item_index = None
         
         self.update_inventory_display()
@@ -632,84 +351,24 @@ class LootSystemGUI(tk.Frame):
         messagebox.showinfo("Item Sold", f"Sold item for {value} coins!")
 
 
-    def raritySys(self, numItems=1, tier="Basic"):
-        opened_items = []
-        multipliers = self.chest_tiers[tier]["rarity_multipliers"]
-        
-        # Base rarity chances
-        base_chances = {
-            "common": 0.515,
-            "uncommon": 0.215,
-            "rare": 0.065,
-            "epic": 0.015,
-            "legendary": 0.005,
-            "mythic": 0.0005,
-            "divine": 0.00005,
-            "unspoken": 0.00005
-        }
-        
-        # Adjust chances using multipliers
-        adjusted_chances = {
-            rarity: base_chances[rarity] * multiplier
-            for rarity, multiplier in multipliers.items()
-        }
-        
-        # Remove excluded rarities (multiplier = 0) and normalize remaining chances
-        total_chance = sum(adjusted_chances.values())
-        normalized_chances = {
-            rarity: chance / total_chance for rarity, chance in adjusted_chances.items() if chance > 0
-        }
-        
-        # Cumulative probability mapping
-        cumulative = []
-        current = 0.0
-        for rarity, prob in normalized_chances.items():
-            current += prob
-            cumulative.append((current, rarity))
-        
-        # Draw items
-        for _ in range(numItems):
-            draw = rand.random()
-            rarity = next(r for c, r in cumulative if draw <= c)
-            
-            item_type = rand.choice(list(self.items[rarity].keys()))
-            item_name = rand.choice(self.items[rarity][item_type])
-            opened_items.append(f"{rarity.capitalize()} Item: {item_name}")
-        
-        return opened_items
-
-
-    
     def open_chest(self, tier):
         amount = 10 if self.bulk_var.get() else 1
         
-        if self.keys[tier] >= amount:
-            self.keys[tier] -= amount
-            new_items = self.raritySys(amount, tier)
-            self.inventory.extend(new_items)
-            
-            # Update stats
-            self.stats['chests_opened'][tier] += amount
-            self.stats['total_chests_opened'] += amount
-
-
-            
-            # Count rarities
-            for item in new_items:
-                rarity = item.split(":")[0].lower().replace(" item", "")
-                self.stats['rarities_found'][rarity] += 1
+        try:
+            self.engine.open_chest(tier, amount)
+        except GameError as e:
+            messagebox.showwarning(e.title, e.message)
+            return
             
-            self.update_inventory_display()
-            self.update_stats_display()  # Changed from update_economy_display
-            self.update_counters()
-        else:
-            messagebox.showwarning("Not Enough Keys", 
-                                f"You need {amount} {tier} key(s) to open this chest!")
-
-    
-
-
+        if self.engine.auto_equip:
+            self.update_equipment_display()
+            self.update_character_display()
+        self.update_inventory_display()
+        self.update_stats_display()  # Changed from update_economy_display
+        self.update_counters()
 
+    def toggle_auto_equip(self):
+        self.engine.auto_equip = self.auto_equip_var.get()
 
 
     def update_inventory_display(self):
@@ -726,8 +385,7 @@ class LootSystemGUI(tk.Frame):
             row = i // self.items_per_row
             col = i % self.items_per_row
             
-            name = item.split(":")[1].strip()
-            rarity = item.split(":")[0].lower().replace(" item", "")
+            rarity, name = parse_item(item)
             
             # Create frame for item slot
             slot_frame = ttk.Frame(self.inventory_grid)
@@ -752,8 +410,9 @@ class LootSystemGUI(tk.Frame):
             btn.bind("<Button-1>", lambda e, idx=i: self.on_inventory_click(idx))
             btn.bind("<Button-3>", lambda e, idx=i: self.show_context_menu(e, idx))
             
-            # Add tooltip
-            self.create_tooltip(btn, tooltip_text)
+            # Add tooltip, with the stat change from equipping it worked out on hover
+            self.create_tooltip(btn, lambda text=tooltip_text, r=rarity, n=name:
+                                text + self.get_equip_preview_text(r, n))
 
 
     def create_context_menu(self):
@@ -766,7 +425,16 @@ class LootSystemGUI(tk.Frame):
         self.context_menu.post(event.x_root, event.y_root)
 
 
+    def get_equip_preview_text(self, rarity, name):
+        delta = self.engine.equip_preview(rarity, name)
+        if delta is None:
+            return ""
+        changes = [f"{label} {value:+}" for label, value in
+                   (("ATK", delta.attack), ("DEF", delta.defense), ("HP", delta.max_health)) if value]
+        return "\nIf equipped: " + (" | ".join(changes) if changes else "no change")
+
     def create_tooltip(self, widget, text):
+        # text may be a function, called each time the tooltip is shown
         def show_tooltip(event):
             x, y, _, _ = widget.bbox("insert")
             x += widget.winfo_rootx() + 25
@@ -777,7 +445,7 @@ class LootSystemGUI(tk.Frame):
             self.tooltip.wm_overrideredirect(True)
             self.tooltip.wm_geometry(f"+{x}+{y}")
             
-            label = ttk.Label(self.tooltip, text=text, justify='left',
+            label = ttk.Label(self.tooltip, text=text() if callable(text) else text, justify='left',
                             background="#ffffff", relief='solid', borderwidth=3)
             label.pack()
         
@@ -802,7 +470,7 @@ class LootSystemGUI(tk.Frame):
     def update_counters(self):
         counts = {rarity: 0 for rarity in self.items.keys()}
         for item in self.inventory:
-            rarity = item.split(":")[0].lower().replace(" item", "")
+            rarity, _ = parse_item(item)
             counts[rarity] += 1
         
         for rarity, count in counts.items():
@@ -819,8 +487,7 @@ class LootSystemGUI(tk.Frame):
         filtered_indices = []  # Store original indices
         
         for idx, item in enumerate(self.inventory):
-            name = item.split(":")[1].strip()
-            rarity = item.split(":")[0].lower().replace(" item", "")
+            rarity, name = parse_item(item)
             
             # Check rarity filter
             if rarity_filter != "all" and rarity != rarity_filter:
@@ -829,11 +496,7 @@ class LootSystemGUI(tk.Frame):
             # Check type filter
             if type_filter != "all":
                 # Find item type by checking which category it belongs to
-                item_type = None
-                for type_name, items in self.items[rarity].items():
-                    if any(item_name in name for item_name in items):
-                        item_type = type_name
-                        break
+                item_type = find_item_type(rarity, name)
                 
                 if type_filter.lower() != item_type.lower():
                     continue
@@ -870,6 +533,11 @@ class LootSystemGUI(tk.Frame):
                                    command=self.upgrade_max_adventures)
         self.upgrade_button.pack(pady=5)
         
+        # Finish every running adventure right away
+        ttk.Button(self.adventure_frame,
+                   text="Skip Active Adventures",
+                   command=self.skip_adventures).pack(pady=5)
+        
         
         for zone_name, zone_info in self.adventure.zones.items():
             frame = ttk.Frame(self.adventure_frame)
@@ -888,32 +556,41 @@ class LootSystemGUI(tk.Frame):
         self.combat_log_frame = ttk.LabelFrame(adventure_container, text="Combat Log", padding="5")
         self.combat_log_frame.pack(fill="both", expand=True, pady=5)
         
+        # Zone filter and paging through the archive
+        log_controls = ttk.Frame(self.combat_log_frame)
+        log_controls.pack(fill="x", pady=(0, 5))
+        self.log_zone_var = tk.StringVar(value="All")
+        log_zone_filter = ttk.Combobox(log_controls, textvariable=self.log_zone_var, state="readonly",
+                                       values=["All"] + list(self.adventure.zones.keys()))
+        log_zone_filter.pack(side="left", padx=5)
+        log_zone_filter.bind('<<ComboboxSelected>>', self.on_log_zone_selected)
+        ttk.Button(log_controls, text="Latest", command=self.show_latest_log).pack(side="right", padx=2)
+        ttk.Button(log_controls, text="Newer", command=self.show_newer_log).pack(side="right", padx=2)
+        ttk.Button(log_controls, text="Older", command=self.show_older_log).pack(side="right", padx=2)
+        
         self.combat_log = tk.Text(self.combat_log_frame, wrap=tk.WORD, height=20)
         self.combat_log.pack(fill="both", expand=True)
         
         combat_scroll = ttk.Scrollbar(self.combat_log_frame, command=self.combat_log.yview)
         combat_scroll.pack(side="right", fill="y")
         self.combat_log.config(yscrollcommand=combat_scroll.set)
+        self.combat_log_view = CombatLogView(self.combat_log, max_lines=self.combat_log_lines,
+                                             formatter=format_event)
         
         
     def upgrade_max_adventures(self):
-        if self.stats['coins'] >= self.upgrade_cost:
-            self.stats['coins'] -= self.upgrade_cost
-            self.stats['coins_spent'] += self.upgrade_cost
-            self.max_adventures += 1
-            self.stats['max_adventures'] = self.max_adventures
-            
-            # Update the upgrade cost for next time
-            self.upgrade_cost = math.floor(self.upgrade_cost * 1.5)  # Increase by 50% each time
-            # Update the button text with new cost
-            self.upgrade_button.config(text=f"Upgrade Max Adventures ({self.upgrade_cost:,} coins)")
+        try:
+            self.engine.upgrade_max_adventures()
+        except GameError as e:
+            messagebox.showwarning(e.title, e.message)
+            return
             
-            self.update_stats_display()
-            messagebox.showinfo("Upgrade Successful", 
-                            f"Maximum adventures increased to {self.max_adventures}!")
-        else:
-            messagebox.showwarning("Not Enough Coins",
-                                f"You need {self.upgrade_cost:,} coins to upgrade!")
+        # Update the button text with new cost
+        self.upgrade_button.config(text=f"Upgrade Max Adventures ({self.upgrade_cost:,} coins)")
+        
+        self.update_stats_display()
+        messagebox.showinfo("Upgrade Successful", 
+                        f"Maximum adventures increased to {self.max_adventures}!")
         
     def create_character_frame(self):
         self.character_frame = ttk.LabelFrame(self.right_frame, text="Character", padding="5")
@@ -978,22 +655,30 @@ class LootSystemGUI(tk.Frame):
                     text="Unequip",
                     command=lambda s=slot: self.unequip_item(s)).pack()
 
+        # Loadout optimizer
+        optimize_frame = ttk.Frame(self.equipment_frame)
+        optimize_frame.grid(row=1, column=0, columnspan=6, pady=(5,0))
+        self.optimize_goals = {
+            "Balanced": {"attack": 1, "defense": 1, "max_health": 1},
+            "Attack": {"attack": 1},
+            "Defense": {"defense": 1},
+            "Health": {"max_health": 1}
+        }
+        for zone_name in self.adventure.zones:
+            self.optimize_goals[f"Survive {zone_name}"] = zone_name
+        self.optimize_goal_var = tk.StringVar(value="Balanced")
+        ttk.Combobox(optimize_frame, textvariable=self.optimize_goal_var, state="readonly",
+                     values=list(self.optimize_goals), width=24).pack(side="left", padx=5)
+        ttk.Button(optimize_frame, text="Optimize Loadout",
+                   command=self.optimize_loadout).pack(side="left", padx=5)
+
      
         
 
 
     
     def unequip_item(self, slot):
-        if self.character.equipped[slot]:
-            item = self.character.equipped[slot]
-            # Create inventory text format
-            item_text = f"{item.rarity.capitalize()} Item: {item.name}"
-            self.inventory.append(item_text)
-            
-            # Remove from equipped
-            self.character.equipped[slot] = None
-            self.character.compute_stats()
-            
+        if self.engine.unequip_item(slot):
             # Update displays
             self.equipment_buttons[slot].configure(image="")
             self.equipment_labels[slot].config(text="None", foreground="black")
@@ -1002,44 +687,30 @@ class LootSystemGUI(tk.Frame):
             self.update_counters()
 
 
+    def optimize_loadout(self):
+        goal = self.optimize_goals[self.optimize_goal_var.get()]
+        if isinstance(goal, str):
+            equipped = self.engine.optimize_loadout(zone_name=goal)
+        else:
+            equipped = self.engine.optimize_loadout(weights=goal)
+        if not equipped:
+            return
+        self.selected_item_index = None
+
+        # Update displays
+        self.update_equipment_display()
+        self.update_inventory_display()
+        self.update_character_display()
+        self.update_counters()
+
     def equip_selected_item(self):
         if self.selected_item_index is None:
             return
         
         inventory_index = self.filtered_indices[self.selected_item_index]
-        item_text = self.inventory[inventory_index]
         
-        # Parse item information
-        name = item_text.split(":")[1].strip()
-        rarity = item_text.split(":")[0].lower().replace(" item", "")
-        
-        # Debug print
-        print(f"Equipping item: {name} ({rarity})")
-        
-        # Determine item type
-        item_type = None
-        for type_name, items in self.items[rarity].items():
-            if any(item_name.lower() in name.lower() for item_name in items):
-                item_type = type_name
-                break
-        
-        if not item_type:
+        if not self.engine.equip_item(inventory_index):
             return
-        
-        # Convert staff to weapon slot
-        slot = "weapon" if item_type in ["weapon", "staff"] else item_type
-        
-        # If there's already an item equipped, move it to inventory
-        if self.character.equipped[slot]:
-            old_item = self.character.equipped[slot]
-            self.inventory.append(f"{old_item.rarity.capitalize()} Item: {old_item.name}")
-        
-        # Create and equip new item
-        item = Item(name, rarity, item_type)
-        self.character.equip_item(item)
-        
-        # Remove equipped item from inventory
-        del self.inventory[inventory_index]
         self.selected_item_index = None
         
         # Update displays
@@ -1080,140 +751,83 @@ class LootSystemGUI(tk.Frame):
 
 
 
-    def add_to_combat_log(self, message):
-        self.combat_log.insert(tk.END, message + "\n")
-        self.combat_log.see(tk.END)
-
-    def start_adventure(self, zone_name):
-        if self.current_adventures >= self.max_adventures:
-            self.add_to_combat_log(f"Cannot start new adventure. Maximum of {self.max_adventures} concurrent adventures reached!")
-            return
-        
-        
-        zone = self.adventure.zones[zone_name]
-
-        # LEVEL REQ.
-        if self.character.level < zone["level"]:
-            self.add_to_combat_log(f"Need level {zone['level']} to enter {zone_name}!")
-            return
-
-        
-        # Create unique identifier for this adventure
-        adventure_id = f"{zone_name}_{self.current_adventures}"
-        
-        self.current_adventures += 1
-        self.stats["active_adventures"] = self.current_adventures
-        self.update_stats_display()
-        
-
-        
+    def add_to_combat_log(self, event):
+        self.combat_archive.append(event)
+        # Buffered, only formatted when written to the widget
+        if self.log_live and (self.log_zone is None or event.zone == self.log_zone):
+            self.combat_log_view.add(event)
 
-        # Initialize combat manager for this adventure
-        self.combat_managers[adventure_id] = CombatManager(zone_name, zone, self.character)
-        self.combat_managers[adventure_id].combat_active = True
-        
-        # Store adventure information
-        self.active_adventures[adventure_id] = {
-            'zone_name': zone_name,
-            'zone': zone,
-            'timer': Timer(zone["time"], lambda: self.complete_adventure(adventure_id))
-        }
-        
-        # Add to combat log
-        self.add_to_combat_log(f"\nEntering {zone_name}...")
-        
-        # Start combat tick for this adventure
-        self.root.after(1000, lambda: self.combat_tick(adventure_id))
-        
-        # Start adventure timer
-        self.active_adventures[adventure_id]['timer'].start()
+    def show_log_page(self, page):
+        self.log_first_id = page[0][0] if page else None
+        self.log_last_id = page[-1][0] if page else None
+        self.combat_log_view.show(event for _, event in page)
 
+    def show_latest_log(self):
+        self.log_live = True
+        self.show_log_page(self.combat_archive.page(self.log_page_size, zone=self.log_zone))
 
-    def combat_tick(self, adventure_id):
-        if adventure_id not in self.combat_managers:
-            return
-            
-        combat_manager = self.combat_managers[adventure_id]
-        if not combat_manager.combat_active:
+    def show_older_log(self):
+        first_id = self.log_first_id
+        if self.log_live:
+            # The live view has moved on since the last page was loaded
+            latest = self.combat_archive.page(self.log_page_size, zone=self.log_zone)
+            first_id = latest[0][0] if latest else None
+        if first_id is None:
             return
-        
-        # Spawn new enemy if needed
-        if not combat_manager.current_enemy or not combat_manager.current_enemy.is_alive():
-            combat_manager.current_enemy = combat_manager.spawn_enemy()
-            combat_manager.enemies_defeated += 1
-            self.add_to_combat_log(f"\n[{combat_manager.zone_name}] Encountered {combat_manager.current_enemy.name}!")
-        
-        # Player attack
-        damage_to_enemy = max(1, self.character.computed_stats["attack"] - 
-                            combat_manager.current_enemy.defense)
-        combat_manager.current_enemy.health -= damage_to_enemy
-        self.add_to_combat_log(
-            f"[{combat_manager.zone_name}] You deal {damage_to_enemy} damage to {combat_manager.current_enemy.name} "
-            f"({combat_manager.current_enemy.health}/{combat_manager.current_enemy.max_health} HP)"
-        )
-        
-        # Enemy attack if still alive
-        if combat_manager.current_enemy.is_alive():
-            damage_to_player = max(1, combat_manager.current_enemy.attack - 
-                                self.character.computed_stats["defense"])
-            self.character.computed_stats["health"] -= damage_to_player
-            self.add_to_combat_log(
-                f"[{combat_manager.zone_name}] {combat_manager.current_enemy.name} deals {damage_to_player} damage to you "
-                f"({self.character.computed_stats['health']}/{self.character.computed_stats['max_health']} HP)"
-            )
-        
-        # Check for player death
-        if self.character.computed_stats["health"] <= 0:
-            self.add_to_combat_log(f"\n[{combat_manager.zone_name}] You have been defeated!")
-            combat_manager.combat_active = False
-            self.character.computed_stats["health"] = 0
-            self.update_character_display()
+        page = self.combat_archive.page(self.log_page_size, zone=self.log_zone, before=first_id)
+        if page:
+            self.log_live = False
+            self.show_log_page(page)
+
+    def show_newer_log(self):
+        if self.log_live or self.log_last_id is None:
             return
-        
-        # Update character display
-        self.update_character_display()
-        
-        # Schedule next combat tick if adventure is still active
-        if adventure_id in self.active_adventures and combat_manager.combat_active:
-            self.root.after(1000, lambda: self.combat_tick(adventure_id))
+        page = self.combat_archive.page(self.log_page_size, zone=self.log_zone, after=self.log_last_id)
+        if len(page) < self.log_page_size:
+            self.show_latest_log()  # caught up, follow new events again
+        else:
+            self.show_log_page(page)
+
+    def on_log_zone_selected(self, event=None):
+        zone = self.log_zone_var.get()
+        self.log_zone = None if zone == "All" else zone
+        self.show_latest_log()
+
+    def autosave(self):
+        # Only captures the state here, the writer thread does the rest
+        self.journal.snapshot()
+        self.root.after(self.autosave_ms, self.autosave)
+        error = self.saver.take_error()
+        if error is not None:
+            messagebox.showwarning("Autosave Failed", f"The game couldn't be saved: {error}")
+
+    def on_close(self):
+        # Nothing may reach the widgets, archive or journal once they're closed
+        if self.runtime:
+            self.runtime.close()
+        self.engine.on_event = None
+        self.engine.on_change = None
+        self.journal.snapshot()
+        self.journal.close()
+        self.saver.close()
+        self.combat_archive.close()
+        self.root.destroy()
 
-    def complete_adventure(self, adventure_id):
-        self.root.after(0, lambda: self._complete_adventure(adventure_id))
+    def start_adventure(self, zone_name):
+        if self.runtime:
+            adventure_id = self.runtime.start(zone_name)
+        else:
+            adventure_id = self.engine.start_adventure(zone_name)
+        if adventure_id is not None:
+            self.update_stats_display()
 
-    def _complete_adventure(self, adventure_id):
-        if adventure_id not in self.combat_managers:
-            return
-            
-        combat_manager = self.combat_managers[adventure_id]
-        combat_manager.combat_active = False
-        zone = self.active_adventures[adventure_id]['zone']
-        
-        self.current_adventures -= 1
-        self.stats["active_adventures"] = self.current_adventures
-        self.update_stats_display()
-        
-        # Calculate and apply rewards
-        base_coins = rand.randint(*zone["coin_reward"])
-        base_exp = rand.randint(*zone["exp_reward"])
-        
-        coins_earned = math.floor(base_coins * (1 + combat_manager.enemies_defeated * 0.2))
-        exp_earned = math.floor(base_exp * (1 + combat_manager.enemies_defeated * 0.2))
-        
-        self.stats['coins'] += coins_earned
-        self.stats['coins_earned'] += coins_earned
-        self.stats['adventures_completed'] += 1
-        self.stats['total_enemies_defeated'] += combat_manager.enemies_defeated
-        self.stats['total_exp_earned'] += exp_earned
-        self.character.gain_exp(exp_earned)
-        
-        self.add_to_combat_log(f"\n[{combat_manager.zone_name}] Adventure Complete!")
-        self.add_to_combat_log(f"[{combat_manager.zone_name}] Enemies Defeated: {combat_manager.enemies_defeated}")
-        self.add_to_combat_log(f"[{combat_manager.zone_name}] Earned: {coins_earned} coins and {exp_earned} exp!")
-        
-        # Cleanup
-        del self.combat_managers[adventure_id]
-        del self.active_adventures[adventure_id]
-        
+    def skip_adventures(self):
+        for adventure_id in self.engine.adventures:
+            self.engine.skip_adventure(adventure_id)
+        self.on_engine_update()
+
+    def on_engine_update(self):
+        # Called after every combat tick and adventure completion
         self.update_character_display()
         self.update_stats_display()
 
@@ -1266,7 +880,7 @@ class LootSystemGUI(tk.Frame):
 
     def get_stats_text(self):
         stats = self.character.computed_stats
-        return f"ATK: {stats['attack']} | DEF: {stats['defense']} | HP: {stats['health']}/{stats['max_health']}"
+        return f"ATK: {stats.attack} | DEF: {stats.defense} | HP: {stats.health}/{stats.max_health}"
 
 
 def main():
@@ -1274,5 +888,18 @@ def main():
     app = LootSystemGUI(root)
     root.mainloop()
 
+def main_asyncio():
+    # Adventures run as coroutines and Tk is pumped from the asyncio loop
+    async def run():
+        root = tk.Tk()
+        app = LootSystemGUI(root, clock=AsyncioClock())
+        app.runtime = AdventureRuntime(app.engine)
+        await run_tk(root)
+
+    asyncio.run(run())
+
 if __name__ == "__main__":
-    main()
+    if "--asyncio" in sys.argv:
+        main_asyncio()
+    else:
+        main()
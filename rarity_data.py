@@ -20,4 +20,28 @@ RARITY_MULTIPLIERS = {
     "mythic": 32,
     "divine": 64,
     "unspoken": 128
-}
\ No newline at end of file
+}
+
+# Chance of each rarity dropping from a chest before tier multipliers
+BASE_RARITY_CHANCES = {
+    "common": 0.515,
+    "uncommon": 0.215,
+    "rare": 0.065,
+    "epic": 0.015,
+    "legendary": 0.005,
+    "mythic": 0.0005,
+    "divine": 0.00005,
+    "unspoken": 0.00005
+}
+
+# Sell price for each rarity
+PRICE_MULTIPLIERS = {
+    "common": 10,
+    "uncommon": 25,
+    "rare": 75,
+    "epic": 200,
+    "legendary": 500,
+    "mythic": 1500,
+    "divine": 5000,
+    "unspoken": 15000
+}
@@ -0,0 +1,281 @@
+# save_game.py
+#
+# Saves and loads a GameEngine's persistent state in a small binary format:
+#
+#   header      b"LOOTSAVE", u16 version, u16 flags (1 = body is zlib'd)
+#   counters    u32 count, then (name, int) pairs: coins and other stats
+#               (nested ones as "chests_opened.Basic"), "keys.<tier>",
+#               "engine.max_adventures", "engine.upgrade_cost", plus any
+#               extra counters the caller adds (e.g. "journal.sequence")
+#   character   level, exp, current health and held damage (see
+#               Character.held_damage) as ints; version 1 saves have no
+#               held damage
+#   item names  u32 count, then each distinct "Rarity Item: Name" string once
+#   equipment   u8 count, then (slot name, i32 index into item names or -1)
+#   inventory   u32 count, u8 id size (2 or 4), then the packed ids
+#
+# Names are u16-length-prefixed UTF-8 and ints are u8-length-prefixed signed
+# little-endian, so values are never cut off however big they grow. Base
+# stats and exp_needed aren't stored, they follow from the level. Running
+# adventures aren't saved.
+
+import os
+import struct
+import zlib
+from array import array
+from collections import namedtuple
+
+from game_engine import GameError, format_item, parse_item, find_item_type, get_item
+from item_data import ITEMS
+
+SAVE_PATH = "saves/savegame.bin"
+SAVE_MAGIC = b"LOOTSAVE"
+SAVE_VERSION = 2
+FLAG_ZLIB = 1
+
+_HEADER = struct.Struct("<8sHH")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+
+_CHUNK = 1 << 14  # inventory entries encoded per step
+
+# Counters that describe running adventures and aren't saved
+_TRANSIENT = {"active_adventures"}
+
+# Everything a save holds, captured at one moment. `inventory` is the
+# engine's own list, pinned so the engine leaves it alone until it's encoded.
+SaveState = namedtuple("SaveState", ["counters", "level", "exp", "health", "held_damage", "equipped",
+                                     "inventory"])
+
+
+def _pack_name(out, name):
+    data = name.encode("utf-8")
+    out += _U16.pack(len(data))
+    out += data
+
+
+def _pack_int(out, value):
+    data = int(value).to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+    out += _U8.pack(len(data))
+    out += data
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def take(self, size):
+        if self.pos + size > len(self.data):
+            raise GameError("Can't Load Save", "The save file is truncated.")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def unpack(self, fmt):
+        return fmt.unpack(self.take(fmt.size))[0]
+
+    def name(self):
+        return str(self.take(self.unpack(_U16)), "utf-8")
+
+    def int(self):
+        return int.from_bytes(self.take(self.unpack(_U8)), "little", signed=True)
+
+
+def _counters(engine):
+    for name, value in engine.stats.items():
+        if name in _TRANSIENT:
+            continue
+        if isinstance(value, dict):
+            for key, count in value.items():
+                yield f"{name}.{key}", count
+        else:
+            yield name, value
+    for tier, count in engine.keys.items():
+        yield f"keys.{tier}", count
+    yield "engine.max_adventures", engine.max_adventures
+    yield "engine.upgrade_cost", engine.upgrade_cost
+
+
+def capture(engine, extra=None):
+    """Snapshot engine's saved state without copying the inventory.
+
+    Pass the result to encode_state() (from any thread) and then
+    release_state(), which unpins the inventory.
+    """
+    counters = list(_counters(engine))
+    if extra:
+        counters.extend(extra.items())
+    character = engine.character
+    equipped = [(slot, format_item(item.rarity, item.name) if item else None)
+                for slot, item in character.equipped.items()]
+    return SaveState(counters, character.level, character.exp, character.computed_stats.health,
+                     character.held_damage, equipped, engine.pin_inventory())
+
+
+def release_state(engine, state):
+    engine.unpin_inventory(state.inventory)
+
+
+def encode(engine, compress=True, extra=None):
+    state = capture(engine, extra)
+    try:
+        return encode_state(state, compress)
+    finally:
+        release_state(engine, state)
+
+
+def encode_state(state, compress=True):
+    out = bytearray()
+    out += _U32.pack(len(state.counters))
+    for name, value in state.counters:
+        _pack_name(out, name)
+        _pack_int(out, value)
+
+    _pack_int(out, state.level)
+    _pack_int(out, state.exp)
+    _pack_int(out, state.health)
+    _pack_int(out, state.held_damage)
+
+    # Every distinct item string once, referenced by index
+    names = {}
+    equipped = state.equipped
+    for _, entry in equipped:
+        if entry is not None:
+            names.setdefault(entry, len(names))
+    # Big inventories go in chunks so a background save never holds the GIL
+    # for long in one call
+    inventory = state.inventory
+    chunks = range(0, len(inventory), _CHUNK)
+    for start in chunks:
+        for entry in dict.fromkeys(inventory[start:start + _CHUNK]):
+            names.setdefault(entry, len(names))
+    ids = array("H" if len(names) <= 0xFFFF else "I")
+    for start in chunks:
+        ids.extend(map(names.__getitem__, inventory[start:start + _CHUNK]))
+
+    out += _U32.pack(len(names))
+    for entry in names:
+        _pack_name(out, entry)
+
+    out += _U8.pack(len(equipped))
+    for slot, entry in equipped:
+        _pack_name(out, slot)
+        out += _I32.pack(-1 if entry is None else names[entry])
+
+    out += _U32.pack(len(ids))
+    out += _U8.pack(ids.itemsize)
+    out += ids.tobytes()
+
+    body = zlib.compress(out, 1) if compress else bytes(out)
+    return _HEADER.pack(SAVE_MAGIC, SAVE_VERSION, FLAG_ZLIB if compress else 0) + body
+
+
+def decode(engine, data):
+    """Replace engine's saved state with the one in `data`.
+
+    Returns every counter read, including ones the engine doesn't use.
+    """
+    if len(data) < _HEADER.size:
+        raise GameError("Can't Load Save", "The save file is truncated.")
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise GameError("Can't Load Save", "This isn't a save file.")
+    if version > SAVE_VERSION:
+        raise GameError("Can't Load Save", f"Save version {version} is newer than this game supports.")
+    try:
+        body = data[_HEADER.size:]
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        reader = _Reader(body)
+
+        counters = {}
+        for _ in range(reader.unpack(_U32)):
+            name = reader.name()
+            counters[name] = reader.int()
+        level, exp, health = reader.int(), reader.int(), reader.int()
+        held_damage = reader.int() if version >= 2 else 0
+        names = [reader.name() for _ in range(reader.unpack(_U32))]
+        for entry in names:
+            # Every name has to be an item the game knows, written the way
+            # format_item writes it
+            rarity, name = parse_item(entry)
+            if format_item(rarity, name) != entry or rarity not in ITEMS or not find_item_type(rarity, name):
+                raise KeyError(f"unknown item {entry!r}")
+        equipped = {}
+        for _ in range(reader.unpack(_U8)):
+            slot = reader.name()
+            index = reader.unpack(_I32)
+            if index >= 0:
+                rarity, name = parse_item(names[index])
+                equipped[slot] = get_item(name, rarity)
+        count = reader.unpack(_U32)
+        ids = array({2: "H", 4: "I"}[reader.unpack(_U8)])
+        ids.frombytes(reader.take(count * ids.itemsize))
+        if ids and max(ids) >= len(names):
+            raise IndexError("item id out of range")
+        if level < 1:
+            raise KeyError(f"level {level}")
+    except (zlib.error, KeyError, IndexError, UnicodeDecodeError) as e:
+        # Checked before anything is applied, so a bad save leaves the engine as it was
+        raise GameError("Can't Load Save", f"The save file is damaged ({e}).") from e
+
+    # Counters the game doesn't know (any more) are skipped
+    for name, value in counters.items():
+        group, _, key = name.partition(".")
+        if group == "keys":
+            if key in engine.keys:
+                engine.keys[key] = value
+        elif group == "engine":
+            if key in ("max_adventures", "upgrade_cost"):
+                setattr(engine, key, value)
+        elif key:
+            if isinstance(engine.stats.get(group), dict):
+                engine.stats[group][key] = value
+        elif group in engine.stats:
+            engine.stats[group] = value
+
+    character = engine.character
+    for slot in character.equipped:
+        character.unequip(slot)
+    character.set_level(level, exp)
+    for slot, item in equipped.items():
+        if item is not None and slot in character.equipped:
+            character.equip_item(item)
+    character.computed_stats.health = max(0, min(health, character.computed_stats.max_health))
+    character.held_damage = max(0, held_damage)
+
+    engine.set_inventory(map(names.__getitem__, ids))
+    engine.stats["max_adventures"] = engine.max_adventures
+    return counters
+
+
+def write_save(data, path=SAVE_PATH):
+    """Write encoded save data to path, replacing any earlier save in one step."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_game(engine, path=SAVE_PATH, compress=True, extra=None):
+    write_save(encode(engine, compress, extra), path)
+
+
+def load_game(engine, path=SAVE_PATH):
+    """Load the save at path into engine.
+
+    Returns the counters read (see decode), or None if there's no save.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return decode(engine, data)
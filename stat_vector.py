@@ -0,0 +1,110 @@
+# stat_vector.py
+#
+# Character and item stats as a fixed layout of four numbers instead of a
+# dict. Summing gear or comparing items is plain field arithmetic, and a
+# list of vectors turns straight into a NumPy array (one row per character
+# or item, columns in STAT_NAMES order) for mass simulations.
+#
+# Fields are read by name (stats.attack); stats["attack"] and stats[0] work
+# too, so code written against the old dicts keeps working.
+
+STAT_NAMES = ("attack", "defense", "health", "max_health")
+ATTACK, DEFENSE, HEALTH, MAX_HEALTH = range(len(STAT_NAMES))
+
+
+class StatVector:
+    __slots__ = STAT_NAMES
+
+    def __init__(self, attack=0, defense=0, health=0, max_health=0):
+        self.attack = attack
+        self.defense = defense
+        self.health = health
+        self.max_health = max_health
+
+    def __getitem__(self, key):
+        return getattr(self, key if isinstance(key, str) else STAT_NAMES[key])
+
+    def __setitem__(self, key, value):
+        setattr(self, key if isinstance(key, str) else STAT_NAMES[key], value)
+
+    def __iter__(self):
+        return iter((self.attack, self.defense, self.health, self.max_health))
+
+    def __len__(self):
+        return len(STAT_NAMES)
+
+    def items(self):
+        return zip(STAT_NAMES, self)
+
+    def copy(self):
+        return StatVector(self.attack, self.defense, self.health, self.max_health)
+
+    def __add__(self, other):
+        return StatVector(self.attack + other.attack, self.defense + other.defense,
+                          self.health + other.health, self.max_health + other.max_health)
+
+    def __sub__(self, other):
+        return StatVector(self.attack - other.attack, self.defense - other.defense,
+                          self.health - other.health, self.max_health - other.max_health)
+
+    def __mul__(self, factor):
+        return StatVector(self.attack * factor, self.defense * factor,
+                          self.health * factor, self.max_health * factor)
+
+    __rmul__ = __mul__
+
+    def __iadd__(self, other):
+        self.attack += other.attack
+        self.defense += other.defense
+        self.health += other.health
+        self.max_health += other.max_health
+        return self
+
+    def __isub__(self, other):
+        self.attack -= other.attack
+        self.defense -= other.defense
+        self.health -= other.health
+        self.max_health -= other.max_health
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, StatVector):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __le__(self, other):
+        # No worse in every stat
+        return all(a <= b for a, b in zip(self, other))
+
+    def __ge__(self, other):
+        return all(a >= b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "StatVector(" + ", ".join(f"{name}={value}" for name, value in self.items()) + ")"
+
+
+class FrozenStatVector(StatVector):
+    """A StatVector that can't be changed, for stats shared by many objects.
+
+    Arithmetic returns plain StatVectors, and += or -= rebind rather than
+    change it in place, like they do on a tuple.
+    """
+    __slots__ = ()
+
+    def __init__(self, attack=0, defense=0, health=0, max_health=0):
+        for name, value in zip(STAT_NAMES, (attack, defense, health, max_health)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FrozenStatVector can't be changed (tried to set {name})")
+
+    __iadd__ = StatVector.__add__
+    __isub__ = StatVector.__sub__
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return "Frozen" + super().__repr__()
@@ -0,0 +1,97 @@
+# vector_combat.py
+#
+# GameEngine.combat_tick for many adventures at once, for large simulations.
+# Each adventure is one lane of a set of NumPy arrays (player stats, the
+# current enemy's stats and health, counters), and tick() runs one round for
+# every lane with array arithmetic instead of a CombatManager per adventure.
+#
+# A round is the same as combat_tick:
+#   - spawn a new enemy if there is none or it is dead (counts as an encounter)
+#   - player hits for max(1, attack - enemy defense)
+#   - if the enemy survived it hits back for max(1, enemy attack - defense)
+#   - once player health drops to 0 it is clamped there and the lane stops
+#
+# Unlike the engine, where every adventure shares the character's health,
+# each lane has its own player health.
+
+import numpy as np
+
+from game_engine import enemy_template
+
+
+class VectorCombat:
+    def __init__(self, enemy_level, attack, defense, health, max_health=None):
+        """One lane per adventure; arguments are per-lane arrays or scalars."""
+        enemy_level, attack, defense, health = np.broadcast_arrays(
+            *(np.asarray(value, dtype=np.int64) for value in (enemy_level, attack, defense, health)))
+        count = len(enemy_level)
+
+        # Enemy stats come from the engine's templates so the two can't drift apart
+        template = enemy_template(1)
+        self.enemy_max_health = enemy_level * template.max_health
+        self.enemy_attack = enemy_level * template.attack
+        self.enemy_defense = enemy_level * template.defense
+
+        self.attack = attack.copy()
+        self.defense = defense.copy()
+        self.health = health.copy()
+        self.max_health = self.health.copy() if max_health is None else np.broadcast_to(
+            np.asarray(max_health, dtype=np.int64), (count,)).copy()
+
+        self.enemy_health = np.zeros(count, dtype=np.int64)  # 0 = no enemy yet
+        self.encounters = np.zeros(count, dtype=np.int64)    # the engine's enemies_defeated
+        self.kills = np.zeros(count, dtype=np.int64)
+        self.damage_taken = np.zeros(count, dtype=np.int64)
+        self.active = np.ones(count, dtype=bool)
+        self.ticks = 0
+
+    @classmethod
+    def for_zone(cls, zone_info, character_stats, count):
+        """`count` adventures in one zone, each starting from character_stats."""
+        return cls(np.full(count, zone_info["level"]), character_stats.attack,
+                   character_stats.defense, character_stats.health, character_stats.max_health)
+
+    @classmethod
+    def from_stats(cls, enemy_level, stats):
+        """One lane per StatVector in `stats` (e.g. many characters' computed_stats)."""
+        attack, defense, health, max_health = np.array([tuple(vector) for vector in stats], dtype=np.int64).T
+        return cls(enemy_level, attack, defense, health, max_health)
+
+    def __len__(self):
+        return len(self.active)
+
+    def tick(self):
+        """Run one round in every active lane. Returns how many are still active."""
+        active = self.active
+
+        # Spawn new enemies where needed
+        spawn = active & (self.enemy_health <= 0)
+        self.enemy_health[spawn] = self.enemy_max_health[spawn]
+        self.encounters += spawn
+
+        # Player attack
+        damage_to_enemy = np.maximum(1, self.attack - self.enemy_defense)
+        self.enemy_health -= np.where(active, damage_to_enemy, 0)
+        alive = self.enemy_health > 0
+        self.kills += active & ~alive
+
+        # Enemy attack if still alive
+        hit = active & alive
+        damage_to_player = np.where(hit, np.maximum(1, self.enemy_attack - self.defense), 0)
+        self.health -= damage_to_player
+        self.damage_taken += damage_to_player
+
+        # Check for player death
+        dead = active & (self.health <= 0)
+        self.health[dead] = 0
+        active &= ~dead
+
+        self.ticks += 1
+        return int(np.count_nonzero(active))
+
+    def run(self, ticks):
+        """Run up to `ticks` rounds, stopping early once every lane is down."""
+        for _ in range(ticks):
+            if not self.tick():
+                break
+        return self